@@ -3,44 +3,197 @@
 Analyze feature field in PR data
 """
 
+import glob
 import json
+import mmap
+import os
+import sys
+from operator import itemgetter
+from typing import NamedTuple
 
-def analyze_features():
-    with open('pr_data_20250808_115049.json', 'r') as f:
-        data = json.load(f)
+# orjson parses straight from bytes and is several times faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson lets very large dumps be streamed without keeping every PR body alive
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# merged_at threshold for "recent" PRs (last 2 weeks of the 2025-08-08 dump)
+RECENT_MERGED_CUTOFF = 1754003800
+
+# Number of feature strings shown as examples
+FEATURE_SAMPLE_SIZE = 10
+
+# Number of merged-with-feature PRs shown as examples
+MERGED_SAMPLE_SIZE = 5
+
+# Bound formatter for sample lines, compiled once instead of per-row f-strings
+_SAMPLE_LINE = "PR #{0}: {1} - Feature: '{2}'".format
+
+# Fields read by the aggregation, pulled out of each record in a single C call
+_FEATURE_FIELDS = itemgetter('feature', 'is_merged', 'merged_at')
+
+# Keys the analysis reads; everything else (body, files, summaries) is dropped
+_PROJECTED_KEYS = frozenset(('pr_number', 'title', 'feature', 'is_merged', 'merged_at'))
+
+# Dumps at least this large are streamed with ijson instead of parsed whole
+_STREAM_THRESHOLD_BYTES = 256 * 1024 * 1024
+
+# Bump when the cached stats layout changes so stale sidecars are recomputed
+_STATS_CACHE_VERSION = 2
+
+class MergedSample(NamedTuple):
+    """Compact row kept for each sampled merged PR instead of its whole dict"""
+    pr_number: int
+    title: str
+    feature: str
+
+def _latest_dump(pattern='pr_data_*.json'):
+    """Return the most recently written PR dump in the working directory"""
+    dumps = glob.glob(pattern)
+    return max(dumps, key=os.path.getmtime) if dumps else None
+
+def _load_prs(path):
+    """Load a PR dump, preferring orjson over a read-only memory map"""
+    with open(path, 'rb') as f:
+        # Dumps are read front to back; let the kernel read ahead aggressively
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        if orjson is None:
+            return json.load(f)
+        # Parse the mapped pages directly instead of copying them into a bytes object
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+def _iter_projected_prs(path):
+    """Stream PR records from a dump, building only the keys in _PROJECTED_KEYS"""
+    with open(path, 'rb') as f:
+        record = None
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == 'item':
+                if event == 'start_map':
+                    record = {}
+                elif event == 'end_map':
+                    yield record
+            elif record is not None and prefix.startswith('item.') and prefix[5:] in _PROJECTED_KEYS:
+                # Only scalar events reach here; nested keys have longer prefixes
+                record[prefix[5:]] = value
+
+def _read_prs(path):
+    """Return an iterable of PR records, streaming large dumps when ijson is available"""
+    if ijson is not None and os.path.getsize(path) >= _STREAM_THRESHOLD_BYTES:
+        return _iter_projected_prs(path)
+    return _load_prs(path)
+
+def _aggregate_features(data, cutoff=RECENT_MERGED_CUTOFF):
+    """Compute every feature statistic in one scan over the PR records"""
+    total = with_features = empty_features = 0
+    merged_with_features = recent_merged_with_features = 0
+    min_date = max_date = None
+    sample_features = []
+    merged_samples = []
+    
+    # Bind module globals to locals so the loop uses LOAD_FAST instead of dict lookups
+    fields = _FEATURE_FIELDS
+    feature_sample_size = FEATURE_SAMPLE_SIZE
+    merged_sample_size = MERGED_SAMPLE_SIZE
+    sample_row = MergedSample
     
-    print(f"Total PRs: {len(data)}")
+    for pr in data:
+        total += 1
+        try:
+            feature, is_merged, merged_at = fields(pr)
+        except KeyError:
+            # Older dumps may omit some fields
+            feature, is_merged, merged_at = pr.get('feature'), pr.get('is_merged'), pr.get('merged_at')
+        
+        if feature:
+            with_features += 1
+            if with_features <= feature_sample_size:
+                sample_features.append(feature)
+        else:
+            empty_features += 1
+        
+        if not is_merged:
+            continue
+        
+        # Track time range for merged PRs
+        if merged_at:
+            if min_date is None:
+                min_date = max_date = merged_at
+            elif merged_at < min_date:
+                min_date = merged_at
+            elif merged_at > max_date:
+                max_date = merged_at
+        
+        if feature:
+            merged_with_features += 1
+            # The running count doubles as the sample bound
+            if merged_with_features <= merged_sample_size:
+                merged_samples.append(sample_row(pr.get('pr_number'), pr.get('title'), feature))
+            # Add the comparison result directly rather than branching on it
+            recent_merged_with_features += (merged_at or 0) > cutoff
     
-    # Count PRs with features
-    features = [pr.get('feature', '') for pr in data if pr.get('feature')]
-    print(f"PRs with features: {len(features)}")
+    return {
+        'total': total,
+        'with_features': with_features,
+        'empty_features': empty_features,
+        'merged_with_features': merged_with_features,
+        'recent_merged_with_features': recent_merged_with_features,
+        'min_date': min_date,
+        'max_date': max_date,
+        'sample_features': sample_features,
+        'merged_samples': merged_samples,
+    }
+
+def _load_stats(path, cutoff=RECENT_MERGED_CUTOFF):
+    """Return aggregated stats for a dump, reusing a sidecar cache when it is fresh"""
+    cache_path = path + '.stats'
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(path):
+            with open(cache_path, 'r') as f:
+                cached = json.load(f)
+            if cached.get('version') == _STATS_CACHE_VERSION and cached.get('cutoff') == cutoff:
+                return cached['stats']
+    except (OSError, ValueError, KeyError):
+        pass
     
-    # Count empty features
-    empty_features = sum(1 for pr in data if not pr.get('feature') or pr.get('feature') == '')
-    print(f"PRs with empty features: {empty_features}")
+    stats = _aggregate_features(_read_prs(path), cutoff)
+    try:
+        with open(cache_path, 'w') as f:
+            json.dump({'version': _STATS_CACHE_VERSION, 'cutoff': cutoff, 'stats': stats}, f)
+    except OSError as e:
+        print(f"Warning: could not write stats cache {cache_path}: {e}")
+    return stats
+
+def analyze_features(path=None):
+    path = path or _latest_dump()
+    if not path:
+        print("No pr_data_*.json dump found")
+        return
     
-    # Show sample features
-    print(f"Sample features: {features[:10]}")
+    print(f"Analyzing {path}")
+    stats = _load_stats(path)
     
-    # Check for merged PRs with features
-    merged_with_features = [pr for pr in data if pr.get('is_merged') and pr.get('feature')]
-    print(f"Merged PRs with features: {len(merged_with_features)}")
+    print(f"Total PRs: {stats['total']}")
+    print(f"PRs with features: {stats['with_features']}")
+    print(f"PRs with empty features: {stats['empty_features']}")
+    print(f"Sample features: {stats['sample_features']}")
+    print(f"Merged PRs with features: {stats['merged_with_features']}")
     
-    # Show some merged PRs with features
+    # Show some merged PRs with features in one buffered write
     print("\nSample merged PRs with features:")
-    for pr in merged_with_features[:5]:
-        print(f"PR #{pr.get('pr_number')}: {pr.get('title')} - Feature: '{pr.get('feature')}'")
+    sys.stdout.write(''.join(_SAMPLE_LINE(*row) + '\n' for row in stats['merged_samples']))
     
-    # Check time range for merged PRs
-    merged_prs = [pr for pr in data if pr.get('is_merged')]
-    if merged_prs:
-        merged_dates = [pr.get('merged_at') for pr in merged_prs if pr.get('merged_at')]
-        if merged_dates:
-            print(f"\nMerged PRs date range: {min(merged_dates)} to {max(merged_dates)}")
+    if stats['min_date'] is not None:
+        print(f"\nMerged PRs date range: {stats['min_date']} to {stats['max_date']}")
     
-    # Check recent merged PRs with features
-    recent_merged_with_features = [pr for pr in merged_with_features if pr.get('merged_at', 0) > 1754003800]  # Last 2 weeks
-    print(f"Recent merged PRs with features (last 2 weeks): {len(recent_merged_with_features)}")
+    print(f"Recent merged PRs with features (last 2 weeks): {stats['recent_merged_with_features']}")
 
 if __name__ == "__main__":
-    analyze_features()
+    analyze_features(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -5,48 +5,196 @@ Adapted for serverless deployment on Vercel.
 """
 
 import os
-import json
-from datetime import datetime, timedelta, date
+import re
+import abc
+import time
+import asyncio
+import hashlib
+import importlib.util
+from functools import lru_cache
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
-from fastapi import FastAPI, HTTPException, Query
+import numpy as np
+import orjson
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from pymilvus import connections, Collection, utility
-import openai
-from openai import OpenAI
-from supabase import create_client, Client
+import httpx
 import logging
 
-# Initialize FastAPI app
-app = FastAPI(title="WhatTheRepo", description="GitHub PR analysis and insights")
+# Request-path diagnostics go through logging so they cost only a level check when disabled
+# (only this logger follows LOG_LEVEL; httpx would otherwise log every OpenAI call at INFO)
+logging.basicConfig()
+logger = logging.getLogger("search")
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+# Connections are set up by the app lifespan, or lazily by the first request on
+# runtimes (such as Vercel's) that don't run lifespan events
+_connections_initialized = False
+_connections_lock = asyncio.Lock()
+
+async def _ensure_connections():
+    """Initialize Milvus and OpenAI once, concurrently, off the event loop"""
+    global _connections_initialized
+    
+    if _connections_initialized:
+        return
+    async with _connections_lock:
+        if _connections_initialized:
+            return
+        await asyncio.gather(asyncio.to_thread(_init_milvus), asyncio.to_thread(_init_openai))
+        _connections_initialized = True
+
+async def _close_connections():
+    """Release the Milvus channel and the OpenAI connection pool"""
+    global milvus_collection, openai_client, _connections_initialized
+    
+    try:
+        if milvus_collection is not None:
+            from pymilvus import connections
+            await asyncio.to_thread(connections.disconnect, "default")
+        if openai_client is not None:
+            await openai_client.close()
+    except Exception as e:
+        print(f"⚠️ Error closing connections: {e}")
+    
+    milvus_collection = None
+    openai_client = None
+    _connections_initialized = False
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open backend connections once at startup and release them on shutdown"""
+    await _ensure_connections()
+    yield
+    await _close_connections()
+
+# Initialize FastAPI app; orjson encodes the nested search payloads much faster than json
+app = FastAPI(
+    title="WhatTheRepo",
+    description="GitHub PR analysis and insights",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+
+# Enable CORS for frontend; set CORS_ALLOWED_ORIGINS (comma-separated) to pin the allowed origins
+CORS_ALLOWED_ORIGINS = [origin.strip() for origin in (os.getenv("CORS_ALLOWED_ORIGINS") or "*").split(",") if origin.strip()]
 
-# Enable CORS for frontend
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type"],
+    max_age=86400,  # let browsers cache preflight responses for a day
 )
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="api/static"), name="static")
+# Static assets whose filename carries a content hash (e.g. main.3f2a9c1b.js) never change
+STATIC_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+STATIC_DEFAULT_CACHE_CONTROL = "public, max-age=3600"
+_FINGERPRINTED_ASSET = re.compile(r"\.[0-9a-f]{8,}\.[A-Za-z0-9]+$")
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that sets Cache-Control and tolerates a missing directory"""
+    
+    async def check_config(self):
+        # Serverless bundles may omit the directory; answer 404s instead of failing
+        if self.directory is not None and not os.path.isdir(self.directory):
+            return
+        await super().check_config()
+    
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if _FINGERPRINTED_ASSET.search(os.fspath(full_path)):
+            response.headers["Cache-Control"] = STATIC_IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["Cache-Control"] = STATIC_DEFAULT_CACHE_CONTROL
+        return response
+
+# Mount static files; check_dir=False skips the startup stat of the directory
+app.mount("/static", CachedStaticFiles(directory="api/static", check_dir=False), name="static")
 
 # Global variables
 milvus_collection = None
 openai_client = None
 embedding_dim = 1536
+vector_index_type = None  # e.g. "IVF_FLAT", "HNSW"; read from the collection at startup
 engineer_lens_ui = None
 
+# Embedding requests arriving within this window are sent to OpenAI together
+EMBEDDING_MODEL = "text-embedding-ada-002"
+EMBEDDING_BATCH_WINDOW = 0.005  # seconds
+EMBEDDING_MAX_BATCH_SIZE = 64
+
+# Concurrent searches arriving within this window share one multi-vector Milvus call
+SEARCH_BATCH_WINDOW = 0.005  # seconds
+SEARCH_MAX_BATCH_SIZE = 32
+
+# Searches group hits by pr_id server-side; without server support, fetch this many
+# times the limit and deduplicate client-side
+SEARCH_OVERFETCH_FACTOR = 3
+_group_by_supported = True
+# Errors from servers that don't know group_by_field name the parameter or field
+_GROUP_BY_UNSUPPORTED_RE = re.compile(r'group_by|group by|groupby', re.IGNORECASE)
+
+# Connection pool sizing for the OpenAI HTTP client
+OPENAI_MAX_CONNECTIONS = 100
+OPENAI_MAX_KEEPALIVE = 20
+
+# LRU cache of query embeddings, keyed by a digest of the normalized query text
+EMBEDDING_CACHE_SIZE = 4096
+_embedding_cache = OrderedDict()
+_embedding_cache_stats = {"hits": 0, "misses": 0}
+
+# Milvus output fields, built once instead of per request
+REPO_NAME_FIELDS = ["repo_name"]
+SEARCH_OUTPUT_FIELDS = [
+    "pr_id", "pr_number", "title", "body", "author_name", "created_at", "merged_at", "status",
+    "repo_name", "is_merged", "is_closed", "feature", "pr_summary", "risk_score", "risk_band",
+    "risk_reasons", "additions", "deletions", "changed_files"
+]
+# Default search payload: what the result list renders. The long pr_summary and
+# risk_reasons texts are only sent with ?full=true or from /api/pr/{pr_id}
+SEARCH_LITE_OUTPUT_FIELDS = [
+    "pr_id", "pr_number", "title", "body", "author_name", "created_at", "merged_at", "status",
+    "is_merged", "is_closed", "feature", "risk_score", "risk_band", "additions", "deletions", "changed_files"
+]
+PR_DETAIL_FIELDS = ["pr_id", "pr_number", "title", "body", "pr_summary", "risk_reasons"]
+
+# The collection is bulk-loaded offline, so reads need not wait for the latest writes
+MILVUS_READ_CONSISTENCY = "Eventually"
+
+# Repository list/row-count cache; repo names only change when new data is loaded.
+# The counts also let searches on unknown repos return [] without touching the index.
+REPOSITORIES_CACHE_TTL = 300  # seconds
+_repositories_cache = {"fetched_at": 0.0, "repos": None, "counts": None}
+_repositories_lock = asyncio.Lock()
+_repositories_refresh_task = None
+REPO_SCAN_BATCH_SIZE = 5000
+
+# Browser/CDN caching for the slow-changing metadata endpoints
+METADATA_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=600"
+
 # Pydantic models
 class SearchRequest(BaseModel):
     query: str
     repo_name: Optional[str] = None
     limit: int = 5
 
-class SearchResult(BaseModel):
+class BatchSearchRequest(BaseModel):
+    queries: List[str]
+    repo_name: Optional[str] = None
+    limit: int = 10
+    full: bool = False
+
+# Built once per hit in the search loop; a slotted dataclass is much lighter than a
+# pydantic model, and orjson serializes it natively. Pydantic is kept for request bodies.
+@dataclass(slots=True)
+class SearchResult:
     pr_id: int
     pr_number: int
     title: str
@@ -65,37 +213,115 @@ class SearchResult(BaseModel):
     pr_summary: str = ""
     risk_score: float = 0.0
     risk_band: str = "low"
-    risk_reasons: list = []
+    risk_reasons: list = field(default_factory=list)
     additions: int = 0
     deletions: int = 0
     changed_files: int = 0
-    file_details: list = []
+    file_details: list = field(default_factory=list)
+
+# Types Milvus already returns as plain Python values; these skip conversion entirely
+_NATIVE_TYPES = frozenset((int, float, bool, str, list, dict, type(None)))
 
 def convert_numpy_types_safe(value):
     """Convert numpy types to Python native types without importing numpy"""
+    value_type = type(value)
+    if value_type in _NATIVE_TYPES:
+        return value
+    
+    # Check if it's a numpy type by checking the type name
+    type_name = value_type.__name__
     try:
-        # Check if it's a numpy type by checking the type name
-        type_name = type(value).__name__
-        
-        if type_name.startswith('int'):
+        if type_name[:3] == 'int':
             return int(value)
-        elif type_name.startswith('float'):
+        if type_name[:5] == 'float':
             return float(value)
-        elif type_name.startswith('bool'):
+        if type_name[:4] == 'bool':
             return bool(value)
-        elif hasattr(value, 'tolist'):  # numpy array
-            return value.tolist()
-        else:
-            return value
-    except Exception:
+        tolist = getattr(value, 'tolist', None)  # numpy array
+        return tolist() if tolist is not None else value
+    except (TypeError, ValueError):
         # If conversion fails, return the original value
         return value
 
-def initialize_connections():
-    """Initialize Milvus and OpenAI connections"""
-    global milvus_collection, openai_client, embedding_dim
+# (SearchResult field, Milvus field, default used when the value is missing or empty)
+_RESULT_FIELDS = (
+    ("pr_id", "pr_id", 0),
+    ("pr_number", "pr_number", 0),
+    ("title", "title", ""),
+    ("content", "body", ""),
+    ("author", "author_name", ""),
+    ("created_at", "created_at", 0),
+    ("merged_at", "merged_at", 0),
+    ("status", "status", ""),
+    ("is_merged", "is_merged", False),
+    ("is_closed", "is_closed", False),
+    ("feature", "feature", ""),
+    ("pr_summary", "pr_summary", ""),
+    ("risk_score", "risk_score", 0.0),
+    ("risk_band", "risk_band", "low"),
+    ("risk_reasons", "risk_reasons", []),  # shared, never mutated
+    ("additions", "additions", 0),
+    ("deletions", "deletions", 0),
+    ("changed_files", "changed_files", 0),
+)
+
+def _build_openai_http_client() -> httpx.AsyncClient:
+    """Long-lived, pre-sized connection pool shared by every OpenAI request"""
+    # HTTP/2 lets batched embedding calls share one connection; it needs the optional h2 package
+    http2 = importlib.util.find_spec("h2") is not None
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(max_connections=OPENAI_MAX_CONNECTIONS, max_keepalive_connections=OPENAI_MAX_KEEPALIVE),
+        timeout=httpx.Timeout(30.0, connect=5.0)
+    )
+
+def _detect_index_type(collection) -> Optional[str]:
+    """Index type of the collection's vector field, or None if it can't be read"""
+    try:
+        for index in collection.indexes:
+            if index.field_name == "vector":
+                return index.params.get("index_type")
+    except Exception as e:
+        print(f"⚠️ Could not read vector index type: {e}")
+    return None
+
+def _search_tuning_params(limit: int, nprobe: Optional[int] = None, ef: Optional[int] = None) -> Dict[str, int]:
+    """Index-specific search params sized to the result limit; explicit values win"""
+    params = {"n_top": limit}
+    index_type = vector_index_type or ""
+    if nprobe is None and index_type.startswith("IVF"):
+        # Small result sets reach good recall after probing only a few clusters
+        nprobe = min(32, max(8, limit * 2))
+    if ef is None and index_type == "HNSW":
+        ef = max(64, limit * 4)
+    if nprobe is not None:
+        params["nprobe"] = nprobe
+    if ef is not None:
+        params["ef"] = max(ef, limit)  # HNSW requires ef >= limit
+    return params
+
+def _warm_up_collection(collection, dim: int):
+    """Run a throwaway search so the first user query doesn't pay for channel/index warm-up"""
+    # A unit vector rather than all zeros: cosine similarity is undefined for a zero vector
+    probe = np.zeros((1, dim), dtype=np.float32)
+    probe[0, 0] = 1.0
+    try:
+        collection.search(
+            data=probe,
+            anns_field="vector",
+            param={"metric_type": "COSINE", "params": {}},
+            limit=1,
+            output_fields=["pr_id"],
+            consistency_level=MILVUS_READ_CONSISTENCY
+        )
+        print("✅ Milvus warm-up search completed")
+    except Exception as e:
+        print(f"⚠️ Milvus warm-up search failed: {e}")
+
+def _init_milvus():
+    """Connect to Milvus, load the collection and warm it up"""
+    global milvus_collection, embedding_dim, vector_index_type
     
-    # Initialize Milvus connection
     milvus_url = os.getenv('MILVUS_URL')
     milvus_token = os.getenv('MILVUS_TOKEN')
     collection_name = os.getenv('COLLECTION_NAME', 'pr_index_what_the_repo')
@@ -104,6 +330,10 @@ def initialize_connections():
         print("⚠️ Milvus credentials not found - some features will be limited")
         return
     
+    # Imported here rather than at module level: pymilvus (grpc/protobuf) and openai
+    # are slow to import and would otherwise add to every serverless cold start
+    from pymilvus import connections, Collection, utility
+    
     try:
         connections.connect(
             alias="default",
@@ -115,55 +345,248 @@ def initialize_connections():
             print(f"⚠️ Collection '{collection_name}' does not exist")
             return
         
-        milvus_collection = Collection(collection_name)
-        milvus_collection.load()
+        collection = Collection(collection_name)
+        collection.load()
         
         # Get actual dimension from collection schema
-        schema = milvus_collection.schema
-        for field in schema.fields:
+        for field in collection.schema.fields:
             if field.name == "vector":
                 embedding_dim = field.params.get('dim', 1536)
                 break
         
         print(f"✅ Connected to Milvus collection '{collection_name}' with dimension {embedding_dim}")
         
+        vector_index_type = _detect_index_type(collection)
+        _warm_up_collection(collection, embedding_dim)
+        milvus_collection = collection
+        
     except Exception as e:
         print(f"❌ Failed to connect to Milvus: {e}")
+
+def _init_openai():
+    """Create the async OpenAI client"""
+    global openai_client
     
-    # Initialize OpenAI client
     openai_api_key = os.getenv('OPENAI_API_KEY')
     if not openai_api_key:
         print("⚠️ OpenAI API key not found - embeddings will not work")
         return
     
     try:
-        openai_client = OpenAI(api_key=openai_api_key)
+        from openai import AsyncOpenAI
+        openai_client = AsyncOpenAI(api_key=openai_api_key, http_client=_build_openai_http_client())
         print("✅ OpenAI client initialized successfully")
     except Exception as e:
         print(f"❌ Failed to initialize OpenAI client: {e}")
 
-def get_embedding(text: str) -> List[float]:
-    """Generate embedding for text using OpenAI"""
+def initialize_connections():
+    """Initialize Milvus and OpenAI connections"""
+    _init_milvus()
+    _init_openai()
+
+def _to_float32(embedding: List[float]) -> np.ndarray:
+    """Pack an embedding into a compact read-only float32 array"""
+    vector = np.ascontiguousarray(embedding, dtype=np.float32)
+    vector.flags.writeable = False
+    return vector
+
+class MicroBatcher(abc.ABC):
+    """Collect concurrent requests for a short window and process them together"""
+    
+    def __init__(self, max_batch_size: int, max_latency: float):
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self._loop = None
+        self._queue = None
+        self._worker = None
+    
+    async def submit(self, item):
+        """Queue an item for the next batch and wait for its result"""
+        loop = asyncio.get_running_loop()
+        # The queue and worker belong to one event loop; recreate them if the loop changed
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        
+        future = loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+    
+    async def _next_batch(self):
+        """Wait for one request, then gather more until the window closes or the batch is full"""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_latency
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+    
+    @abc.abstractmethod
+    async def _process(self, items: list) -> list:
+        """Return one result (or exception) per item, in order"""
+    
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                results = await self._process([item for item, _ in batch])
+            except Exception as e:
+                results = [e] * len(batch)
+            
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+class EmbeddingBatcher(MicroBatcher):
+    """Coalesce concurrent embedding requests into a single OpenAI call"""
+    
+    def __init__(self, max_batch_size: int = EMBEDDING_MAX_BATCH_SIZE, max_latency: float = EMBEDDING_BATCH_WINDOW):
+        super().__init__(max_batch_size, max_latency)
+    
+    async def embed(self, text: str) -> np.ndarray:
+        """Queue text for the next batch and wait for its embedding"""
+        return await self.submit(text)
+    
+    async def _process(self, texts: list) -> list:
+        response = await openai_client.embeddings.create(model=EMBEDDING_MODEL, input=texts)
+        return [_to_float32(item.embedding) for item in sorted(response.data, key=lambda item: item.index)]
+
+def _run_search(vectors: np.ndarray, expr: Optional[str], limit: int, full: bool,
+                nprobe: Optional[int], ef: Optional[int], group_by_pr: bool):
+    """Issue the Milvus vector search over PR embeddings"""
+    params = {"metric_type": "COSINE", "params": _search_tuning_params(limit, nprobe, ef)}
+    if group_by_pr:
+        # Let Milvus return only the best-scoring chunk of each PR
+        params["group_by_field"] = "pr_id"
+    return milvus_collection.search(
+        data=vectors,
+        anns_field="vector",
+        param=params,
+        limit=limit,
+        expr=expr,
+        output_fields=SEARCH_OUTPUT_FIELDS if full else SEARCH_LITE_OUTPUT_FIELDS,
+        consistency_level=MILVUS_READ_CONSISTENCY
+    )
+
+def _has_duplicate_pr_ids(results) -> bool:
+    """True if any query's hits repeat a pr_id, i.e. the search wasn't actually grouped"""
+    for hits in results:
+        pr_ids = [hit.fields.get('pr_id') if hasattr(hit, 'fields') else None for hit in hits]
+        if len(set(pr_ids)) < len(pr_ids):
+            return True
+    return False
+
+def _milvus_search(vectors: np.ndarray, expr: Optional[str], limit: int, full: bool = False,
+                   nprobe: Optional[int] = None, ef: Optional[int] = None):
+    """Run one (possibly multi-vector) PR search; returns one hit list per vector"""
+    global _group_by_supported
+    
+    if _group_by_supported:
+        try:
+            results = _run_search(vectors, expr, limit, full, nprobe, ef, group_by_pr=True)
+        except Exception as e:
+            group_by_error = e
+        else:
+            if not _has_duplicate_pr_ids(results):
+                return results
+            # Servers that predate grouping may ignore the unknown param and return plain hits
+            group_by_error = None
+        
+        # Over-fetch and let _hits_to_results dedupe; only stop grouping for good when the
+        # server rejected or ignored group_by_field, so a transient failure only affects this call
+        results = _run_search(vectors, expr, limit * SEARCH_OVERFETCH_FACTOR, full, nprobe, ef, group_by_pr=False)
+        if group_by_error is None or _GROUP_BY_UNSUPPORTED_RE.search(str(group_by_error)):
+            _group_by_supported = False
+            reason = group_by_error or "server ignored group_by_field (duplicate pr_id hits)"
+            print(f"⚠️ Grouped search unsupported, deduplicating client-side instead: {reason}")
+        else:
+            logger.warning("Grouped search failed, retried ungrouped: %s", group_by_error)
+        return results
+    
+    return _run_search(vectors, expr, limit * SEARCH_OVERFETCH_FACTOR, full, nprobe, ef, group_by_pr=False)
+
+class SearchBatcher(MicroBatcher):
+    """Coalesce concurrent single-query searches into multi-vector Milvus calls"""
+    
+    def __init__(self, max_batch_size: int = SEARCH_MAX_BATCH_SIZE, max_latency: float = SEARCH_BATCH_WINDOW):
+        super().__init__(max_batch_size, max_latency)
+    
+    async def search(self, vector: np.ndarray, expr: Optional[str], limit: int, full: bool = False,
+                     nprobe: Optional[int] = None, ef: Optional[int] = None):
+        """Queue a query vector for the next batch and wait for its hits"""
+        return await self.submit((vector, expr, limit, full, nprobe, ef))
+    
+    async def _process(self, items: list) -> list:
+        # Only searches with the same filter, limit, field set and tuning can share a Milvus call
+        groups = {}
+        for position, (vector, *key) in enumerate(items):
+            groups.setdefault(tuple(key), []).append((position, vector))
+        
+        group_keys = list(groups)
+        outcomes = await asyncio.gather(
+            *[
+                asyncio.to_thread(_milvus_search, np.vstack([vector for _, vector in groups[key]]), *key)
+                for key in group_keys
+            ],
+            return_exceptions=True
+        )
+        
+        results = [None] * len(items)
+        for key, outcome in zip(group_keys, outcomes):
+            for index, (position, _) in enumerate(groups[key]):
+                results[position] = outcome if isinstance(outcome, Exception) else outcome[index]
+        return results
+
+_embedding_batcher = EmbeddingBatcher()
+_search_batcher = SearchBatcher()
+
+def _embedding_cache_key(text: str, model: str = EMBEDDING_MODEL) -> bytes:
+    """Hash the model and query text, with case and whitespace normalized"""
+    normalized = " ".join(text.split()).lower()
+    return hashlib.blake2b(f"{model}\0{normalized}".encode("utf-8"), digest_size=16).digest()
+
+def embedding_cache_info() -> Dict[str, int]:
+    """Hit/miss counters and current size of the query embedding cache"""
+    return {**_embedding_cache_stats, "size": len(_embedding_cache), "maxsize": EMBEDDING_CACHE_SIZE}
+
+async def get_embedding(text: str) -> np.ndarray:
+    """Generate embedding for text using OpenAI, reusing cached results for repeat queries"""
+    key = _embedding_cache_key(text)
+    cached = _embedding_cache.get(key)
+    if cached is not None:
+        _embedding_cache_stats["hits"] += 1
+        _embedding_cache.move_to_end(key)
+        return cached
+    _embedding_cache_stats["misses"] += 1
+    
+    await _ensure_connections()
     if not openai_client:
         raise ValueError("OpenAI client not initialized")
     
     try:
-        response = openai_client.embeddings.create(
-            model="text-embedding-ada-002",
-            input=text
-        )
-        return response.data[0].embedding
+        embedding = await _embedding_batcher.embed(text)
     except Exception as e:
-        print(f"Error generating embedding: {e}")
+        logger.warning("error generating embedding: %s", e)
         raise
+    
+    # Cached vectors are shared between requests; they are read-only float32 arrays
+    _embedding_cache[key] = embedding
+    if len(_embedding_cache) > EMBEDDING_CACHE_SIZE:
+        _embedding_cache.popitem(last=False)
+    return embedding
 
-# Initialize connections on startup
-initialize_connections()
-
-@app.get("/", response_class=HTMLResponse)
-async def home_page():
-    """Home page with repository selection and search interface"""
-    html_content = """
+# The home page is fully static: encode it once at import instead of on every request
+HOME_PAGE_HTML = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -742,184 +1165,291 @@ async def home_page():
     </body>
     </html>
     """
-    return HTMLResponse(content=html_content)
+_HOME_PAGE_BODY = HOME_PAGE_HTML.encode("utf-8")
+_HOME_PAGE_HEADERS = {"Cache-Control": "public, max-age=3600"}
+
+@app.get("/", response_class=HTMLResponse)
+async def home_page():
+    """Home page with repository selection and search interface"""
+    # Build a fresh response around the shared bytes; middleware mutates response headers
+    return HTMLResponse(content=_HOME_PAGE_BODY, headers=_HOME_PAGE_HEADERS)
+
+def _scan_repo_counts() -> Dict[str, int]:
+    """Count rows per repo name by paging through the whole collection"""
+    repo_counts = Counter()
+    scanned = 0
+    iterator = milvus_collection.query_iterator(
+        batch_size=REPO_SCAN_BATCH_SIZE,
+        output_fields=REPO_NAME_FIELDS,
+        consistency_level=MILVUS_READ_CONSISTENCY
+    )
+    try:
+        while True:
+            batch = iterator.next()
+            if not batch:
+                break
+            scanned += len(batch)
+            # One lookup per row; empty names are dropped once after the scan
+            repo_counts.update([row.get('repo_name') for row in batch])
+    finally:
+        iterator.close()
+    
+    repo_counts.pop(None, None)
+    repo_counts.pop('', None)
+    print(f"📊 Repositories endpoint: Scanned {scanned} total records")
+    return dict(repo_counts)
+
+def _encode_with_etag(payload):
+    """Encode payload to JSON bytes and derive a weak ETag from them"""
+    body = orjson.dumps(payload)
+    return body, 'W/"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+def _cached_json_response(request: Request, payload=None, encoded=None) -> Response:
+    """JSON response with ETag/Cache-Control; 304 when the client copy is current"""
+    body, etag = encoded or _encode_with_etag(payload)
+    headers = {"ETag": etag, "Cache-Control": METADATA_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @app.get("/api/repositories")
-async def get_repositories():
+async def get_repositories(request: Request):
     """Get list of available repositories"""
-    global milvus_collection
-    
+    repo_names = await _get_repository_names()
+    if not repo_names:
+        # Don't let clients cache an empty list from a cold or failing backend
+        return repo_names
+    return _cached_json_response(request, repo_names)
+
+async def _get_repository_names():
+    """Return the cached repository list, refreshing it from Milvus when stale"""
+    await _ensure_connections()
     if not milvus_collection:
         print("❌ Repositories endpoint: Milvus collection not initialized")
         # Return empty list instead of raising error for Vercel compatibility
         return []
     
+    cached = _repositories_cache["repos"]
+    if cached is not None and time.monotonic() - _repositories_cache["fetched_at"] < REPOSITORIES_CACHE_TTL:
+        return cached
+    
     try:
-        print(f"🔍 Repositories endpoint: Querying collection for repo names...")
-        
-        # Query for distinct repo names
-        results = milvus_collection.query(
-            expr="",
-            output_fields=["repo_name"],
-            limit=1000
-        )
-        
-        print(f"📊 Repositories endpoint: Found {len(results)} total records")
-        
-        # Extract unique repo names
-        repo_names = list(set(result['repo_name'] for result in results if result.get('repo_name')))
-        repo_names.sort()
-        
-        print(f"✅ Repositories endpoint: Returning {len(repo_names)} unique repositories")
-        return repo_names
+        # Only one request refreshes the cache; the others wait and reuse its result
+        async with _repositories_lock:
+            cached = _repositories_cache["repos"]
+            if cached is not None and time.monotonic() - _repositories_cache["fetched_at"] < REPOSITORIES_CACHE_TTL:
+                return cached
+            
+            print(f"🔍 Repositories endpoint: Querying collection for repo names...")
+            
+            # pymilvus is synchronous; run the scan off the event loop
+            repo_counts = await asyncio.to_thread(_scan_repo_counts)
+            repo_names = sorted(repo_counts)
+            
+            _repositories_cache["repos"] = repo_names
+            _repositories_cache["counts"] = repo_counts
+            _repositories_cache["fetched_at"] = time.monotonic()
+            
+            print(f"✅ Repositories endpoint: Returning {len(repo_names)} unique repositories")
+            return repo_names
         
     except Exception as e:
         print(f"❌ Repositories endpoint: Error fetching repositories: {e}")
         # Return empty list instead of raising error for Vercel compatibility
         return []
 
+# (query, type, description, tags) templates; the selected repo is substituted per request
+_EXAMPLE_QUERY_TEMPLATES = (
+    ("What was shipped in {repo} last week?", "Time-based", "Find PRs shipped in {repo} last 7 days.", ("time", "last_week")),
+    ("Find PRs by author John Doe in {repo}", "Author-based", "Search for PRs authored by a specific user in {repo}.", ("author", "john_doe")),
+    ("What are the top 5 riskiest PRs in {repo}?", "Risk-based", "Identify PRs with the highest risk scores in {repo}.", ("risk", "top_risk")),
+    ("Show me all merged PRs from last month in {repo}", "Status-based", "List all merged PRs from the last 30 days in {repo}.", ("status", "merged", "last_month")),
+    ("What are the most recent PRs in {repo}?", "Recent-based", "Find the latest PRs in {repo}.", ("recent", "latest")),
+)
+
+@lru_cache(maxsize=128)
+def _example_queries_payload(repo: str):
+    """Encoded example queries (and ETag) for a repository, built once per repo"""
+    example_queries = [
+        {"query": query.format(repo=repo), "type": query_type, "description": description.format(repo=repo), "tags": [*tags, repo]}
+        for query, query_type, description, tags in _EXAMPLE_QUERY_TEMPLATES
+    ]
+    return _encode_with_etag({"queries": example_queries})
+
 @app.get("/api/example-queries")
-async def get_example_queries(repo: str = Query(None, description="Selected repository")):
+async def get_example_queries(request: Request, repo: str = Query(None, description="Selected repository")):
     """Get example queries for a specific repository"""
     if not repo:
         return {"queries": []}
 
     try:
-        # Return generic example queries
-        example_queries = [
-            {"query": f"What was shipped in {repo} last week?", "type": "Time-based", "description": f"Find PRs shipped in {repo} last 7 days.", "tags": ["time", "last_week", repo]},
-            {"query": f"Find PRs by author John Doe in {repo}", "type": "Author-based", "description": f"Search for PRs authored by a specific user in {repo}.", "tags": ["author", "john_doe", repo]},
-            {"query": f"What are the top 5 riskiest PRs in {repo}?", "type": "Risk-based", "description": f"Identify PRs with the highest risk scores in {repo}.", "tags": ["risk", "top_risk", repo]},
-            {"query": f"Show me all merged PRs from last month in {repo}", "type": "Status-based", "description": f"List all merged PRs from the last 30 days in {repo}.", "tags": ["status", "merged", "last_month", repo]},
-            {"query": f"What are the most recent PRs in {repo}?", "type": "Recent-based", "description": f"Find the latest PRs in {repo}.", "tags": ["recent", "latest", repo]}
-        ]
-
-        return {"queries": example_queries}
+        return _cached_json_response(request, encoded=_example_queries_payload(repo))
     except Exception as e:
         print(f"Error fetching example queries: {e}")
         return {"queries": []}
 
+def _iter_results(hits, limit: int):
+    """Yield at most `limit` SearchResults from one query's Milvus hits, keeping the best hit per PR"""
+    seen_pr_ids = set()
+    
+    for hit in hits:
+        if len(seen_pr_ids) >= limit:
+            break
+        
+        hit_data = hit.fields if hasattr(hit, 'fields') else {}
+        pr_id = hit_data.get('pr_id', 0)
+        
+        if pr_id in seen_pr_ids:
+            continue
+        
+        seen_pr_ids.add(pr_id)
+        
+        # One pass over the default table: convert numpy values and fill in missing/empty fields
+        values = {}
+        for name, source, default in _RESULT_FIELDS:
+            value = hit_data.get(source)
+            if type(value) not in _NATIVE_TYPES:
+                value = convert_numpy_types_safe(value)
+            values[name] = value or default
+        
+        yield SearchResult(
+            **values,
+            text_type="pr_data",
+            file_path="",
+            function_name="",
+            similarity_score=hit.score,
+            file_details=[]
+        )
+
+def _hits_to_results(hits, limit: int) -> List[SearchResult]:
+    """Turn one query's Milvus hits into at most `limit` SearchResults"""
+    return list(_iter_results(hits, limit))
+
+def _stream_results(hits, limit: int):
+    """Encode results as NDJSON, one line per result, as they are built"""
+    for result in _iter_results(hits, limit):
+        yield orjson.dumps(result) + b"\n"
+
+def _repo_known_empty(repo_name: Optional[str]) -> bool:
+    """True when the cached repo counts say a repo_name filter cannot match any row"""
+    global _repositories_refresh_task
+    if not repo_name:
+        return False
+    
+    counts = _repositories_cache["counts"]
+    if counts is None or time.monotonic() - _repositories_cache["fetched_at"] >= REPOSITORIES_CACHE_TTL:
+        # Refresh in the background; searches never wait on a full collection scan
+        if _repositories_refresh_task is None or _repositories_refresh_task.done():
+            _repositories_refresh_task = asyncio.create_task(_get_repository_names())
+        return False
+    return counts.get(repo_name, 0) == 0
+
+def _quote_string(value: str) -> str:
+    """Quote a value as a Milvus expression string literal (same escaping as milvus_client.quote_string)"""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def _repo_filter(repo_name: Optional[str]) -> Optional[str]:
+    """Milvus filter expression restricting a search to one repository"""
+    return f'repo_name == {_quote_string(repo_name)}' if repo_name else None
+
 @app.get("/api/search")
 async def search_prs_get(
     query: str = Query(..., description="Search query"),
     repo_name: str = Query(None, description="Repository name"),
-    limit: int = Query(10, description="Number of results to return")
+    limit: int = Query(10, description="Number of results to return"),
+    stream: bool = Query(False, description="Stream results as NDJSON"),
+    full: bool = Query(False, description="Include pr_summary and risk_reasons"),
+    nprobe: Optional[int] = Query(None, ge=1, description="IVF clusters to probe (default sized to limit)"),
+    ef: Optional[int] = Query(None, ge=1, description="HNSW search breadth (default sized to limit)")
 ):
     """Search PRs using GET request (for frontend compatibility)"""
+    await _ensure_connections()
     if not milvus_collection:
         return []
+    if _repo_known_empty(repo_name):
+        # Typos and bot scans: no rows can match, so skip the embedding and the index traversal
+        logger.debug("search skipped, unknown repo=%s", repo_name)
+        return []
     
     try:
-        print(f"🔍 Search request: query='{query}', repo='{repo_name}', limit={limit}")
+        logger.debug("search q=%r repo=%s limit=%d", query, repo_name, limit)
         
         # Generate embedding for the query
         try:
-            query_embedding = get_embedding(query)
-            print(f"✅ Generated embedding with {len(query_embedding)} dimensions")
+            query_embedding = await get_embedding(query)
+            logger.debug("embedding ready dims=%d", len(query_embedding))
         except Exception as embed_error:
-            print(f"❌ Embedding generation failed: {embed_error}")
+            logger.warning("embedding generation failed: %s", embed_error)
             return []
         
-        # Search parameters
-        search_params = {
-            "metric_type": "COSINE",
-            "params": {"n_top": limit}
-        }
-        
-        # Build search expression
-        expr = None
-        if repo_name:
-            expr = f'repo_name == "{repo_name}"'
-        
-        print(f"🔍 Performing Milvus vector search with params: {search_params}")
-        
-        # Perform vector search
+        # Perform vector search; concurrent requests are coalesced into one Milvus call
         try:
-            results = milvus_collection.search(
-                data=[query_embedding],
-                anns_field="vector",
-                param=search_params,
-                limit=limit,
-                expr=expr,
-                output_fields=["pr_id", "pr_number", "title", "body", "author_name", "created_at", "merged_at", "status", "repo_name", "is_merged", "is_closed", "feature", "pr_summary", "risk_score", "risk_band", "risk_reasons", "additions", "deletions", "changed_files"]
-            )
-            print(f"✅ Milvus search completed, found {len(results)} result sets")
+            hits = await _search_batcher.search(query_embedding, _repo_filter(repo_name), limit, full, nprobe, ef)
+            logger.debug("milvus search completed")
             
         except Exception as search_error:
-            print(f"❌ Milvus search failed: {search_error}")
+            logger.warning("milvus search failed: %s", search_error)
             return []
         
-        search_results = []
-        seen_pr_ids = set()
+        if stream:
+            return StreamingResponse(_stream_results(hits, limit), media_type="application/x-ndjson")
         
         try:
-            for hits in results:
-                for hit in hits:
-                    hit_data = hit.fields if hasattr(hit, 'fields') else {}
-                    pr_id = hit_data.get('pr_id', 0)
-                    
-                    if pr_id in seen_pr_ids:
-                        continue
-                    
-                    seen_pr_ids.add(pr_id)
-                    
-                    # Convert any numpy types safely
-                    pr_id = convert_numpy_types_safe(pr_id)
-                    pr_number = convert_numpy_types_safe(hit_data.get('pr_number', 0))
-                    title = convert_numpy_types_safe(hit_data.get('title', '')) or ''
-                    body = convert_numpy_types_safe(hit_data.get('body', '')) or ''
-                    author_name = convert_numpy_types_safe(hit_data.get('author_name', '')) or ''
-                    created_at = convert_numpy_types_safe(hit_data.get('created_at', 0)) or 0
-                    merged_at = convert_numpy_types_safe(hit_data.get('merged_at', 0)) or 0
-                    status = convert_numpy_types_safe(hit_data.get('status', '')) or ''
-                    is_merged = convert_numpy_types_safe(hit_data.get('is_merged', False)) or False
-                    is_closed = convert_numpy_types_safe(hit_data.get('is_closed', False)) or False
-                    feature = convert_numpy_types_safe(hit_data.get('feature', '')) or ''
-                    pr_summary = convert_numpy_types_safe(hit_data.get('pr_summary', '')) or ''
-                    risk_score = convert_numpy_types_safe(hit_data.get('risk_score', 0.0)) or 0.0
-                    risk_band = convert_numpy_types_safe(hit_data.get('risk_band', 'low')) or 'low'
-                    risk_reasons = convert_numpy_types_safe(hit_data.get('risk_reasons', [])) or []
-                    additions = convert_numpy_types_safe(hit_data.get('additions', 0)) or 0
-                    deletions = convert_numpy_types_safe(hit_data.get('deletions', 0)) or 0
-                    changed_files = convert_numpy_types_safe(hit_data.get('changed_files', 0)) or 0
-                    
-                    search_results.append(SearchResult(
-                        pr_id=pr_id,
-                        pr_number=pr_number,
-                        title=title,
-                        content=body,
-                        text_type="pr_data",
-                        file_path="",
-                        function_name="",
-                        similarity_score=hit.score,
-                        author=author_name,
-                        created_at=created_at,
-                        merged_at=merged_at,
-                        status=status,
-                        is_merged=is_merged,
-                        is_closed=is_closed,
-                        feature=feature,
-                        pr_summary=pr_summary,
-                        risk_score=risk_score,
-                        risk_band=risk_band,
-                        risk_reasons=risk_reasons,
-                        additions=additions,
-                        deletions=deletions,
-                        changed_files=changed_files,
-                        file_details=[]
-                    ))
-            
-            print(f"✅ Processed {len(search_results)} search results")
-            return search_results
+            search_results = _hits_to_results(hits, limit)
+            logger.debug("processed %d search results", len(search_results))
+            # Returning the response directly skips FastAPI's jsonable_encoder pass
+            return ORJSONResponse(search_results)
             
         except Exception as process_error:
-            print(f"❌ Error processing search results: {process_error}")
+            logger.warning("error processing search results: %s", process_error)
             return []
             
     except Exception as e:
-        print(f"Error performing search: {e}")
+        logger.warning("error performing search: %s", e)
         return []
 
+@app.post("/api/search/batch")
+async def search_prs_batch(request: BatchSearchRequest):
+    """Search PRs for several queries at once; returns one result list per query"""
+    await _ensure_connections()
+    if not milvus_collection or not request.queries or _repo_known_empty(request.repo_name):
+        return [[] for _ in request.queries]
+    
+    try:
+        # Concurrent get_embedding calls are coalesced into a single OpenAI request
+        embeddings = await asyncio.gather(*[get_embedding(query) for query in request.queries])
+        results = await asyncio.to_thread(
+            _milvus_search, np.vstack(embeddings), _repo_filter(request.repo_name), request.limit, request.full
+        )
+        logger.debug("batch search completed for %d queries", len(request.queries))
+        return ORJSONResponse([_hits_to_results(hits, request.limit) for hits in results])
+    except Exception as e:
+        logger.warning("batch search failed: %s", e)
+        return [[] for _ in request.queries]
+
+@app.get("/api/pr/{pr_id}")
+async def get_pr_details(pr_id: int):
+    """Get the long-form fields of one PR (body, summary, risk reasons) for detail views"""
+    await _ensure_connections()
+    if not milvus_collection:
+        raise HTTPException(status_code=503, detail="Milvus collection not initialized")
+    
+    try:
+        rows = await asyncio.to_thread(
+            milvus_collection.query,
+            expr=f"pr_id == {pr_id}",
+            output_fields=PR_DETAIL_FIELDS,
+            limit=1,
+            consistency_level=MILVUS_READ_CONSISTENCY
+        )
+    except Exception as e:
+        print(f"❌ PR details query failed: {e}")
+        raise HTTPException(status_code=502, detail="PR lookup failed")
+    
+    if not rows:
+        raise HTTPException(status_code=404, detail=f"PR {pr_id} not found")
+    return {field: convert_numpy_types_safe(rows[0].get(field)) for field in PR_DETAIL_FIELDS}
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -927,6 +1457,7 @@ async def health_check():
         "status": "healthy", 
         "milvus_connected": milvus_collection is not None,
         "openai_connected": openai_client is not None,
+        "embedding_cache": embedding_cache_info(),
         "deployment": "vercel"
     }
 
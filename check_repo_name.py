@@ -4,34 +4,79 @@ Check repository names in the data
 """
 
 import json
+import os
+
+# orjson parses straight from bytes and is several times faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson lets very large dumps be streamed instead of loaded whole
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+PR_DATA_FILE = 'pr_data_20250808_115049.json'
+
+FEATURE_SAMPLE_SIZE = 5
+
+# Dumps at least this large are streamed when ijson is installed
+_STREAM_THRESHOLD_BYTES = 256 * 1024 * 1024
+
+def _iter_prs(path):
+    """Stream PR records one at a time"""
+    with open(path, 'rb') as f:
+        yield from ijson.items(f, 'item', use_float=True)
+
+def _read_prs(path):
+    """Return an iterable of PR records, streaming large dumps when ijson is available"""
+    if ijson is not None and os.path.getsize(path) >= _STREAM_THRESHOLD_BYTES:
+        return _iter_prs(path)
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read()) if orjson is not None else json.load(f)
 
 def check_repo_names():
-    with open('pr_data_20250808_115049.json', 'r') as f:
-        data = json.load(f)
+    # Tally every repository in a single pass:
+    # repo -> [total PRs, merged PRs, merged PRs with features, sample features]
+    total_prs = 0
+    repo_stats = {}
+    for pr in _read_prs(PR_DATA_FILE):
+        total_prs += 1
+        repo_name = pr.get('repo_name', '')
+        if not repo_name:
+            continue
+        stats = repo_stats.get(repo_name)
+        if stats is None:
+            stats = repo_stats[repo_name] = [0, 0, 0, []]
+        stats[0] += 1
+        if pr.get('is_merged'):
+            stats[1] += 1
+            feature = pr.get('feature')
+            if feature:
+                stats[2] += 1
+                if len(stats[3]) < FEATURE_SAMPLE_SIZE:
+                    stats[3].append(feature)
     
-    print(f"Total PRs: {len(data)}")
+    print(f"Total PRs: {total_prs}")
     
     # Get unique repository names
-    repo_names = set()
-    for pr in data:
-        repo_name = pr.get('repo_name', '')
-        if repo_name:
-            repo_names.add(repo_name)
+    repo_names = set(repo_stats)
     
     print(f"Repository names found: {repo_names}")
     
     # Check merged PRs by repository
     for repo_name in repo_names:
-        merged_prs = [pr for pr in data if pr.get('repo_name') == repo_name and pr.get('is_merged')]
+        total, merged, with_features, sample_features = repo_stats[repo_name]
         print(f"\nRepository: {repo_name}")
-        print(f"  Total PRs: {len([pr for pr in data if pr.get('repo_name') == repo_name])}")
-        print(f"  Merged PRs: {len(merged_prs)}")
+        print(f"  Total PRs: {total}")
+        print(f"  Merged PRs: {merged}")
         
         # Check features in this repo
-        features = [pr.get('feature', '') for pr in merged_prs if pr.get('feature')]
-        print(f"  Merged PRs with features: {len(features)}")
-        if features:
-            print(f"  Sample features: {features[:5]}")
+        print(f"  Merged PRs with features: {with_features}")
+        if sample_features:
+            print(f"  Sample features: {sample_features}")
 
 if __name__ == "__main__":
     check_repo_names()
@@ -11,15 +11,37 @@ def debug_file_timeline():
         client = get_milvus_client()
         print("✅ Milvus client connected successfully")
         
-        # Check for the specific file without time constraints
-        expr = 'repo_name == "DataExpert-io/data-engineer-handbook" and file_id like "%monthly_user_site_hits_job.py%"'
+        # Fetch the repository's files once and match names locally: a leading-wildcard
+        # `like "%...%"` filter is a full scan on the server, and this script needs fifteen of them
+        expr = 'repo_name == "DataExpert-io/data-engineer-handbook"'
         fields = ["file_id", "pr_number", "merged_at"]
+        target = "monthly_user_site_hits_job.py"
+        parts = ["monthly", "user", "site", "hits", "job"]
+        similar_patterns = [
+            "monthly",
+            "user",
+            "site",
+            "hits",
+            "job",
+            "monthly_user",
+            "user_site",
+            "site_hits",
+            "hits_job"
+        ]
         
-        print(f"🔍 Searching for 'monthly_user_site_hits_job.py' without time constraints...")
+        print(f"🔍 Searching for '{target}' without time constraints...")
         print(f"   Expression: {expr}")
         
-        # Query files
-        results = client.query_files(expr, fields)
+        # Stream the files once, collecting matches for every substring in the same pass
+        matches = {substring: [] for substring in [target, *parts, *similar_patterns]}
+        for batch in client.query_files_iter(expr, fields):
+            for file_result in batch:
+                file_id = file_result.get('file_id', '')
+                for substring, matching_files in matches.items():
+                    if substring in file_id:
+                        matching_files.append(file_result)
+        
+        results = matches[target]
         print(f"📊 Files found: {len(results)}")
         
         if results:
@@ -27,16 +49,14 @@ def debug_file_timeline():
             for i, file_result in enumerate(results):
                 print(f"  {i+1}. {file_result.get('file_id')} (PR #{file_result.get('pr_number')}) - Merged: {file_result.get('merged_at')}")
         else:
-            print(f"❌ No files found with exact name 'monthly_user_site_hits_job.py'")
+            print(f"❌ No files found with exact name '{target}'")
             
             # Try broader search
             print(f"\n🔍 Trying broader search...")
             
             # Search for files containing parts of the name
-            parts = ["monthly", "user", "site", "hits", "job"]
             for part in parts:
-                expr_part = f'repo_name == "DataExpert-io/data-engineer-handbook" and file_id like "%{part}%"'
-                results_part = client.query_files(expr_part, fields)
+                results_part = matches[part]
                 print(f"  Files containing '{part}': {len(results_part)}")
                 if results_part:
                     for file_result in results_part[:3]:  # Show first 3
@@ -44,23 +64,10 @@ def debug_file_timeline():
             
             # Check for similar file names
             print(f"\n🔍 Checking for similar file patterns...")
-            similar_patterns = [
-                "%monthly%",
-                "%user%",
-                "%site%",
-                "%hits%",
-                "%job%",
-                "%monthly_user%",
-                "%user_site%",
-                "%site_hits%",
-                "%hits_job%"
-            ]
-            
             for pattern in similar_patterns:
-                expr_similar = f'repo_name == "DataExpert-io/data-engineer-handbook" and file_id like "{pattern}"'
-                results_similar = client.query_files(expr_similar, fields)
+                results_similar = matches[pattern]
                 if results_similar:
-                    print(f"  Pattern '{pattern}': {len(results_similar)} files")
+                    print(f"  Pattern '%{pattern}%': {len(results_similar)} files")
                     for file_result in results_similar[:2]:  # Show first 2
                         print(f"    - {file_result.get('file_id')} (PR #{file_result.get('pr_number')})")
         
@@ -18,32 +18,53 @@ def debug_files():
         print(f"🔍 Querying all files in repository...")
         print(f"   Expression: {expr}")
         
-        # Query files
-        results = client.query_files(expr, fields)
-        print(f"📊 Total files found: {len(results)}")
+        # Stream files in batches and collect everything the report needs in one pass
+        keywords = ["monthly", "user", "hits", "job", "site"]
+        total_files = 0
+        sample_files = []
+        keyword_counts = dict.fromkeys(keywords, 0)
+        keyword_samples = {keyword: [] for keyword in keywords}
+        python_count = 0
+        python_samples = []
         
-        if results:
+        for batch in client.query_files_iter(expr, fields):
+            total_files += len(batch)
+            for file_result in batch:
+                if len(sample_files) < 20:  # Show first 20
+                    sample_files.append(file_result)
+                
+                file_id = file_result.get('file_id', '')
+                file_id_lower = file_id.lower()
+                for keyword in keywords:
+                    if keyword in file_id_lower:
+                        keyword_counts[keyword] += 1
+                        if len(keyword_samples[keyword]) < 5:  # Show first 5
+                            keyword_samples[keyword].append(file_result)
+                
+                if file_id.endswith('.py'):
+                    python_count += 1
+                    if len(python_samples) < 10:  # Show first 10
+                        python_samples.append(file_result)
+        
+        print(f"📊 Total files found: {total_files}")
+        
+        if total_files:
             print(f"📋 Sample files:")
-            for i, file_result in enumerate(results[:20]):  # Show first 20
+            for i, file_result in enumerate(sample_files):
                 print(f"  {i+1}. {file_result.get('file_id', 'unknown')} (PR #{file_result.get('pr_number', 'unknown')})")
             
             # Check for files containing "monthly" or "user" or "hits" or "job"
             print(f"\n🔍 Searching for files containing keywords:")
-            keywords = ["monthly", "user", "hits", "job", "site"]
-            
             for keyword in keywords:
-                matching_files = [f for f in results if keyword.lower() in f.get('file_id', '').lower()]
-                print(f"  Files containing '{keyword}': {len(matching_files)}")
-                if matching_files:
-                    for file_result in matching_files[:5]:  # Show first 5
-                        print(f"    - {file_result.get('file_id')} (PR #{file_result.get('pr_number')})")
+                print(f"  Files containing '{keyword}': {keyword_counts[keyword]}")
+                for file_result in keyword_samples[keyword]:
+                    print(f"    - {file_result.get('file_id')} (PR #{file_result.get('pr_number')})")
             
             # Check for Python files
-            python_files = [f for f in results if f.get('file_id', '').endswith('.py')]
-            print(f"\n🐍 Python files found: {len(python_files)}")
-            if python_files:
+            print(f"\n🐍 Python files found: {python_count}")
+            if python_samples:
                 print(f"  Sample Python files:")
-                for i, file_result in enumerate(python_files[:10]):  # Show first 10
+                for i, file_result in enumerate(python_samples):
                     print(f"    {i+1}. {file_result.get('file_id')} (PR #{file_result.get('pr_number')})")
         
     except Exception as e:
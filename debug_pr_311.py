@@ -48,12 +48,15 @@ def debug_pr_311():
             
             # Check what PRs exist around 311
             print(f"\n🔍 Checking PRs around 311...")
-            for pr_num in range(305, 320):
-                pr_expr_range = f'repo_name == "DataExpert-io/data-engineer-handbook" and pr_number == {pr_num}'
-                pr_results_range = client.query_prs(pr_expr_range, pr_fields)
-                if pr_results_range:
-                    pr_data = pr_results_range[0]
-                    print(f"  PR #{pr_num}: {pr_data.get('title')} (Author: {pr_data.get('author_name')})")
+            # One IN query for the whole range instead of one query per PR number
+            pr_numbers = list(range(305, 320))
+            pr_expr_range = f'repo_name == "DataExpert-io/data-engineer-handbook" and pr_number in {pr_numbers}'
+            prs_by_number = {}
+            for pr_data in client.query_prs(pr_expr_range, pr_fields):
+                prs_by_number.setdefault(pr_data.get('pr_number'), pr_data)
+            for pr_num in sorted(prs_by_number):
+                pr_data = prs_by_number[pr_num]
+                print(f"  PR #{pr_num}: {pr_data.get('title')} (Author: {pr_data.get('author_name')})")
         
     except Exception as e:
         print(f"❌ Error: {e}")
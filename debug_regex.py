@@ -3,15 +3,11 @@
 Debug regex pattern for time expressions
 """
 
-import re
+from time_parse import _TIME_EXPRESSION_PATTERNS, _LAST_RE
 
 def test_regex():
-    # Test the patterns from time_parse.py
-    patterns = [
-        r'last\s+(\d+)\s+(day|week|month|year)s?',
-        r'last\s+(one|two|three|four|five|six|seven|eight|nine|ten)\s+(day|week|month|year)s?',
-        r'last\s+(day|week|month|year)',
-    ]
+    # Test the precompiled "last ..." patterns from time_parse.py, plus the combined one
+    patterns = [*_TIME_EXPRESSION_PATTERNS[:3], _LAST_RE]
     
     test_queries = [
         "last two weeks",
@@ -25,9 +21,9 @@ def test_regex():
     
     print(f"Testing all patterns:")
     for i, pattern in enumerate(patterns, 1):
-        print(f"\nPattern {i}: '{pattern}'")
+        print(f"\nPattern {i}: '{pattern.pattern}'")
         for test_query in test_queries:
-            match = re.search(pattern, test_query)
+            match = pattern.search(test_query)
             if match:
                 print(f"  ✅ '{test_query}' → '{match.group(0)}'")
             else:
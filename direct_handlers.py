@@ -4,9 +4,121 @@ Direct handlers for scalar queries (no vector search).
 Handles PR lists, features shipped, and file analysis.
 """
 
-from collections import defaultdict
+import asyncio
+from collections import Counter
+import heapq
+import logging
 from typing import List, Dict, Any, Optional, Tuple
-from milvus_client import query_prs, query_files
+import numpy as np
+from milvus_client import get_milvus_client, query_prs, query_files, quote_string, run_concurrently
+
+logger = logging.getLogger(__name__)
+
+# Fields returned by the PR list and feature list views
+MERGED_PR_FIELDS = [
+    "repo_name", "pr_number", "pr_id", "title", "pr_summary", "created_at", "merged_at", 
+    "author_name", "risk_score", "high_risk", "feature", "changed_files", "additions", "deletions"
+]
+
+# Small columns needed to dedupe, rank and summarize the whole window; the large text
+# fields are only fetched for the rows that are actually returned
+MERGED_PR_RANK_FIELDS = [
+    "pr_id", "merged_at", "risk_score", "high_risk", "feature", "additions", "deletions", "changed_files"
+]
+# Collections loaded with the precomputed total_changes column rank "largest" on it directly
+MERGED_PR_RANK_FIELDS_TOTAL = ["pr_id", "merged_at", "risk_score", "high_risk", "feature", "total_changes"]
+
+def _rank_fields() -> List[str]:
+    """Ranking columns to fetch; one total_changes column replaces three when available"""
+    if "total_changes" in get_milvus_client().pr_field_names:
+        return MERGED_PR_RANK_FIELDS_TOTAL
+    return MERGED_PR_RANK_FIELDS
+
+def _column(rows: List[Dict[str, Any]], field: str, dtype=np.int64) -> np.ndarray:
+    """One field of every row as a NumPy array (missing/null -> 0)"""
+    return np.fromiter((row.get(field) or 0 for row in rows), dtype=dtype, count=len(rows))
+
+def _total_changes(rows: List[Dict[str, Any]]) -> np.ndarray:
+    """Additions + deletions + files changed per row, precomputed at load time when available"""
+    if rows and "total_changes" in rows[0]:
+        return _column(rows, "total_changes")
+    return _column(rows, "additions") + _column(rows, "deletions") + _column(rows, "changed_files")
+
+def _top_rows(rows: List[Dict[str, Any]], values: np.ndarray, limit: int) -> List[Dict[str, Any]]:
+    """The `limit` rows with the largest values, highest first; ties keep their original order"""
+    n = len(rows)
+    if limit <= 0 or n == 0:
+        return []
+    
+    if limit >= n:
+        order = np.argsort(-values, kind="stable")
+    else:
+        # O(n) partition finds the limit-th largest value; everything above it is in,
+        # and the earliest rows equal to it fill the remaining slots
+        kth = np.partition(values, n - limit)[n - limit]
+        above = np.flatnonzero(values > kth)
+        ties = np.flatnonzero(values == kth)[:limit - len(above)]
+        candidates = np.concatenate((above, ties))
+        order = candidates[np.argsort(-values[candidates], kind="stable")]
+    
+    return [rows[i] for i in order]
+
+# Invariant filter clauses
+_MERGED_CLAUSE = 'is_merged == true'
+_CLOSED_CLAUSE = 'is_closed == true'
+_FEATURE_CLAUSE = 'feature != ""'
+_HIGH_RISK_CLAUSE = 'high_risk == true'
+_NOT_BINARY_CLAUSE = 'is_binary == false'
+
+def _window_expr(repo: str, start: int, end: int, *clauses: str, author: Optional[str] = None) -> str:
+    """Filter for a repo's rows merged within [start, end], plus any extra clauses.
+    User-supplied strings are quoted so names containing quotes can't break the expression."""
+    expr_parts = [
+        f'merged_at >= {int(start)}',
+        f'merged_at <= {int(end)}',
+        *clauses,
+        f'repo_name == {quote_string(repo)}'
+    ]
+    
+    if author:
+        expr_parts.append(f'author_name == {quote_string(author)}')
+    
+    return " and ".join(expr_parts)
+
+def _merged_prs_expr(repo: str, start: int, end: int, author: Optional[str] = None) -> str:
+    """Filter for merged PRs of a repo in a time window, optionally by one author"""
+    return _window_expr(repo, start, end, _MERGED_CLAUSE, author=author)
+
+def _fetch_merged_prs(repo: str, start: int, end: int, author: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Ranking columns of every merged PR in the window (paged, no row cap); the PR list
+    and feature views issue the identical query, so the second one is served from the query cache"""
+    return query_prs(_merged_prs_expr(repo, start, end, author), _rank_fields(), limit=None)
+
+def _with_display_fields(expr: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Fetch MERGED_PR_FIELDS for rows already ranked under expr, keeping their order"""
+    pr_ids = [row['pr_id'] for row in rows if row.get('pr_id') is not None]
+    if not pr_ids:
+        return []
+    
+    full_rows = {}
+    for row in query_prs(f'{expr} and pr_id in {pr_ids}', MERGED_PR_FIELDS, limit=max(1000, len(pr_ids))):
+        full_rows.setdefault(row.get('pr_id'), row)
+    return [full_rows[pr_id] for pr_id in pr_ids if pr_id in full_rows]
+
+def _dedupe_by_pr_id(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop rows with a repeated pr_id, keeping the first occurrence"""
+    unique = {}
+    for row in rows:
+        unique.setdefault(row.get('pr_id'), row)
+    
+    # Duplicate diagnostics are only built when someone is reading them
+    if logger.isEnabledFor(logging.DEBUG) and len(unique) != len(rows):
+        pr_count = Counter(row.get('pr_id') for row in rows)
+        for pr_id, count in pr_count.items():
+            if count > 1:
+                logger.debug("duplicate PR ID %s: %d times", pr_id, count)
+    
+    return list(unique.values())
 
 def direct_prs_list(repo: str, start: int, end: int, author: Optional[str] = None, pr_number: Optional[int] = None, limit: int = 100, sort_by_largest: bool = False, sort_by_riskiest: bool = False) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     """
@@ -24,77 +136,32 @@ def direct_prs_list(repo: str, start: int, end: int, author: Optional[str] = Non
         Tuple of (PR list, summary statistics)
     """
     # Build expression
-    expr_parts = [
-        f'merged_at >= {start}',
-        f'merged_at <= {end}',
-        'is_merged == true',
-        f'repo_name == "{repo}"'
-    ]
-    
-    if author:
-        expr_parts.append(f'author_name == "{author}"')
+    expr = _merged_prs_expr(repo, start, end, author)
     
+    # Execute query; a single-PR lookup is selective enough to skip the shared fetch
     if pr_number:
-        expr_parts.append(f'pr_number == {pr_number}')
-    
-    expr = " and ".join(expr_parts)
-    
-    # Query fields - include pr_id for uniqueness
-    fields = [
-        "repo_name", "pr_number", "pr_id", "title", "pr_summary", "created_at", "merged_at", 
-        "author_name", "risk_score", "high_risk", "feature", "changed_files", "additions", "deletions"
-    ]
-    
-    # Execute query
-    rows = query_prs(expr, fields)
-    
-    print(f"📊 Direct PRs List Query Results:")
-    print(f"   Query expression: {expr}")
-    print(f"   Raw rows returned: {len(rows)}")
-    
-    # Check for duplicates by PR ID (more unique than PR number)
-    pr_ids = [r.get('pr_id') for r in rows]
-    unique_pr_ids = set(pr_ids)
-    print(f"   Unique PR IDs: {len(unique_pr_ids)}")
-    print(f"   Duplicate PR IDs: {len(pr_ids) - len(unique_pr_ids)}")
-    
-    if len(pr_ids) != len(unique_pr_ids):
-        print(f"   🔍 Duplicate PR IDs found:")
-        from collections import Counter
-        pr_count = Counter(pr_ids)
-        duplicates = {pr: count for pr, count in pr_count.items() if count > 1}
-        for pr_id, count in duplicates.items():
-            print(f"     PR ID {pr_id}: {count} times")
+        expr = f'{expr} and pr_number == {int(pr_number)}'
+        rows = query_prs(expr, _rank_fields())
+    else:
+        rows = _fetch_merged_prs(repo, start, end, author)
     
     # Remove duplicates by PR ID (keep the first occurrence)
-    seen_prs = set()
-    unique_rows = []
-    for row in rows:
-        pr_id = row.get('pr_id')
-        if pr_id not in seen_prs:
-            seen_prs.add(pr_id)
-            unique_rows.append(row)
-    
-    print(f"   After deduplication: {len(unique_rows)} rows")
+    unique_rows = _dedupe_by_pr_id(rows)
+    logger.debug("PRs list: expr=%s raw=%d unique=%d", expr, len(rows), len(unique_rows))
     
-    # Sort by appropriate criteria
+    # Pick the top `limit` by the requested criteria; keys are extracted into one array
+    # and selected with a partition instead of sorting the whole window
     if sort_by_riskiest:
-        # Sort by risk score (highest first)
-        unique_rows.sort(key=lambda r: r.get("risk_score", 0.0), reverse=True)
-        print(f"   Sorted by risk score (highest first)")
+        # Highest risk score first
+        sort_values = _column(unique_rows, "risk_score", np.float64)
     elif sort_by_largest:
-        # Sort by total changes (additions + deletions + files changed) - largest first
-        unique_rows.sort(key=lambda r: (
-            r.get("additions", 0) + r.get("deletions", 0) + r.get("changed_files", 0)
-        ), reverse=True)
-        print(f"   Sorted by largest changes (total modifications)")
+        # Total changes (additions + deletions + files changed) - largest first
+        sort_values = _total_changes(unique_rows)
     else:
-        # Sort by merged_at (newest first)
-        unique_rows.sort(key=lambda r: r.get("merged_at", 0), reverse=True)
-        print(f"   Sorted by merge date (newest first)")
+        # Newest merge first
+        sort_values = _column(unique_rows, "merged_at")
     
-    # Limit results
-    limited_rows = unique_rows[:limit]
+    limited_rows = _with_display_fields(expr, _top_rows(unique_rows, sort_values, limit))
     
     # Calculate summary statistics using deduplicated rows
     total_prs = len(unique_rows)
@@ -113,7 +180,17 @@ def direct_prs_list(repo: str, start: int, end: int, author: Optional[str] = Non
     
     return limited_rows, summary
 
-def direct_features_list(repo: str, start: int, end: int, author: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+def _newest_per_feature(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One row per case/whitespace-normalized feature tag, the most recently merged one"""
+    newest = {}
+    for row in rows:
+        signature = row['feature'].strip().lower()
+        kept = newest.get(signature)
+        if kept is None or row.get("merged_at", 0) > kept.get("merged_at", 0):
+            newest[signature] = row
+    return list(newest.values())
+
+def direct_features_list(repo: str, start: int, end: int, author: Optional[str] = None, limit: int = 100, collapse_same_feature: bool = True) -> List[Dict[str, Any]]:
     """
     Get list of features shipped.
     
@@ -123,82 +200,37 @@ def direct_features_list(repo: str, start: int, end: int, author: Optional[str]
         end: End timestamp (epoch)
         author: Optional author filter
         limit: Maximum number of results
+        collapse_same_feature: Keep only the newest PR per feature tag
         
     Returns:
         List of feature PRs
     """
-    # Build expression
-    expr_parts = [
-        f'merged_at >= {start}',
-        f'merged_at <= {end}',
-        'is_merged == true',
-        f'repo_name == "{repo}"',
-        'feature != ""'
-    ]
-    
-    if author:
-        expr_parts.append(f'author_name == "{author}"')
+    # Reuse the PR list's fetch; features are filtered from it below instead of a second query
+    expr = _merged_prs_expr(repo, start, end, author)
+    rows = _fetch_merged_prs(repo, start, end, author)
     
-    expr = " and ".join(expr_parts)
-    
-    # Query fields
-    fields = [
-        "repo_name", "pr_number", "pr_id", "title", "pr_summary", "created_at", "merged_at", 
-        "author_name", "risk_score", "high_risk", "feature", "changed_files", "additions", "deletions"
-    ]
-    
-    # Execute query
-    rows = query_prs(expr, fields)
-    
-    print(f"📊 Direct Features Query Results:")
-    print(f"   Query expression: {expr}")
-    print(f"   Raw rows returned: {len(rows)}")
-    if rows:
-        print(f"   Sample row: {rows[0]}")
-        print(f"   Features found: {sum(1 for r in rows if r.get('feature') and r.get('feature').strip())}")
-        
-        # Debug: Show all feature values
-        print(f"   🔍 Feature values found:")
+    # Feature value breakdown is only computed when debug logging is on
+    if rows and logger.isEnabledFor(logging.DEBUG):
         feature_values = [r.get('feature', '') for r in rows if r.get('feature')]
-        print(f"   Feature values: {feature_values[:10]}")  # Show first 10
-        print(f"   Empty features: {sum(1 for r in rows if not r.get('feature') or r.get('feature') == '')}")
-        print(f"   Null features: {sum(1 for r in rows if r.get('feature') is None)}")
-    
-    # Check for duplicates by PR ID (more unique than PR number)
-    pr_ids = [r.get('pr_id') for r in rows]
-    unique_pr_ids = set(pr_ids)
-    print(f"   Unique PR IDs: {len(unique_pr_ids)}")
-    print(f"   Duplicate PR IDs: {len(pr_ids) - len(unique_pr_ids)}")
-    
-    if len(pr_ids) != len(unique_pr_ids):
-        print(f"   🔍 Duplicate PR IDs found:")
-        from collections import Counter
-        pr_count = Counter(pr_ids)
-        duplicates = {pr: count for pr, count in pr_count.items() if count > 1}
-        for pr_id, count in duplicates.items():
-            print(f"     PR ID {pr_id}: {count} times")
+        logger.debug("Features: expr=%s raw=%d sample=%s", expr, len(rows), rows[0])
+        logger.debug("Feature values (first 10): %s", feature_values[:10])
+        logger.debug("Empty features: %d, null features: %d",
+                     len(rows) - len(feature_values), sum(1 for r in rows if r.get('feature') is None))
     
     # Remove duplicates by PR ID (keep the first occurrence)
-    seen_prs = set()
-    unique_rows = []
-    for row in rows:
-        pr_id = row.get('pr_id')
-        if pr_id not in seen_prs:
-            seen_prs.add(pr_id)
-            unique_rows.append(row)
-    
-    print(f"   After deduplication: {len(unique_rows)} rows")
+    unique_rows = _dedupe_by_pr_id(rows)
     
     # Filter to only include PRs with actual features (using the feature field)
     feature_rows = [r for r in unique_rows if r.get('feature') and r.get('feature').strip()]
-    print(f"   After feature filtering: {len(feature_rows)} rows")
     
-    # Sort by merged_at (newest first)
-    feature_rows.sort(key=lambda r: r.get("merged_at", 0), reverse=True)
+    # PRs stamped from one template share a feature tag and would flood the list;
+    # keep one (the newest) per normalized tag
+    if collapse_same_feature:
+        feature_rows = _newest_per_feature(feature_rows)
     
-    # Limit results
-    limited_rows = feature_rows[:limit]
-    print(f"   Limited to {len(limited_rows)} results")
+    # Newest `limit` features by merged_at
+    limited_rows = _with_display_fields(expr, _top_rows(feature_rows, _column(feature_rows, "merged_at"), limit))
+    logger.debug("Features: unique=%d with feature=%d returned=%d", len(unique_rows), len(feature_rows), len(limited_rows))
     
     return limited_rows
 
@@ -215,7 +247,7 @@ def direct_top_file_by_lines(repo: str, start: int, end: int) -> Optional[Dict[s
         File information with total lines changed, or None if no files found
     """
     # Build expression
-    expr = f'merged_at >= {start} and merged_at <= {end} and repo_name == "{repo}" and is_binary == false'
+    expr = _window_expr(repo, start, end, _NOT_BINARY_CLAUSE)
     
     # Query fields
     fields = ["file_id", "lines_changed", "pr_number"]
@@ -226,30 +258,36 @@ def direct_top_file_by_lines(repo: str, start: int, end: int) -> Optional[Dict[s
     if not rows:
         return None
     
-    # Aggregate lines changed by file
-    file_totals = defaultdict(lambda: {"file_path": "", "lines": 0, "pr_count": 0})
-    
-    for row in rows:
-        file_id = row.get("file_id")
-        if file_id:
-            file_totals[file_id]["file_path"] = file_id  # Use file_id as file_path since file_path doesn't exist
-            file_totals[file_id]["lines"] += int(row.get("lines_changed") or 0)
-            file_totals[file_id]["pr_count"] += 1
-    
-    if not file_totals:
+    rows = [row for row in rows if row.get("file_id")]
+    if not rows:
         return None
     
+    # Number files in first-seen order so ties resolve to the earliest file, then
+    # aggregate lines and PR counts per file with bincount instead of a Python loop
+    file_index = {}
+    codes = np.fromiter((file_index.setdefault(row["file_id"], len(file_index)) for row in rows), dtype=np.int64, count=len(rows))
+    lines = np.fromiter((int(row.get("lines_changed") or 0) for row in rows), dtype=np.int64, count=len(rows))
+    line_totals = np.bincount(codes, weights=lines)
+    pr_counts = np.bincount(codes)
+    
     # Find file with most lines changed
-    top_file_id = max(file_totals, key=lambda k: file_totals[k]["lines"])
-    top_file = file_totals[top_file_id]
+    top = int(np.argmax(line_totals))
+    top_file_id = list(file_index)[top]
     
     return {
         "file_id": top_file_id,
-        "file_path": top_file["file_path"],
-        "total_lines_changed": top_file["lines"],
-        "pr_count": top_file["pr_count"]
+        "file_path": top_file_id,  # Use file_id as file_path since file_path doesn't exist
+        "total_lines_changed": int(line_totals[top]),
+        "pr_count": int(pr_counts[top])
     }
 
+def _count_authors(client, expr: str) -> Counter:
+    """PR count per author, streamed over every matching PR so no rows are retained"""
+    author_counts = Counter()
+    for batch in client.query_prs_iter(expr, ["author_name"]):
+        author_counts.update([row.get("author_name", "Unknown") for row in batch])
+    return author_counts
+
 def direct_pr_count(repo: str, start: int, end: int, author: Optional[str] = None) -> Dict[str, Any]:
     """
     Get count of PRs with breakdowns.
@@ -264,51 +302,31 @@ def direct_pr_count(repo: str, start: int, end: int, author: Optional[str] = Non
         Dictionary with PR counts and breakdowns
     """
     # Build expression
-    expr_parts = [
-        f'merged_at >= {start}',
-        f'merged_at <= {end}',
-        f'repo_name == "{repo}"'
-    ]
-    
-    if author:
-        expr_parts.append(f'author_name == "{author}"')
-    
-    expr = " and ".join(expr_parts)
-    
-    # Query fields
-    fields = [
-        "is_merged", "is_closed", "feature", "high_risk", 
-        "risk_score", "author_name"
-    ]
-    
-    # Execute query
-    rows = query_prs(expr, fields)
-    
-    # Calculate counts
-    total_prs = len(rows)
-    merged_prs = sum(1 for r in rows if r.get("is_merged"))
-    closed_prs = sum(1 for r in rows if r.get("is_closed"))
-    feature_prs = sum(1 for r in rows if r.get("feature") and r.get("feature").strip())
-    high_risk_prs = sum(1 for r in rows if r.get("high_risk"))
+    expr = _window_expr(repo, start, end, author=author)
+    
+    # Counts are computed server-side with count(*); only author names are fetched as rows
+    client = get_milvus_client()
+    (total_prs, merged_prs, closed_prs, feature_prs, high_risk_prs,
+     high_band, medium_band, author_counts) = run_concurrently([
+        (client.count_prs, expr),
+        (client.count_prs, f'{expr} and {_MERGED_CLAUSE}'),
+        (client.count_prs, f'{expr} and {_CLOSED_CLAUSE}'),
+        (client.count_prs, f'{expr} and {_FEATURE_CLAUSE}'),
+        (client.count_prs, f'{expr} and {_HIGH_RISK_CLAUSE}'),
+        (client.count_prs, f'{expr} and risk_score >= 7.0'),
+        (client.count_prs, f'{expr} and risk_score >= 4.0 and risk_score < 7.0'),
+        (_count_authors, client, expr),
+    ])
     
     # Author breakdown
-    author_counts = defaultdict(int)
-    for row in rows:
-        author = row.get("author_name", "Unknown")
-        author_counts[author] += 1
-    
-    top_authors = sorted(author_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+    top_authors = author_counts.most_common(5)
     
     # Risk distribution
-    risk_distribution = {"low": 0, "medium": 0, "high": 0}
-    for row in rows:
-        risk_score = row.get("risk_score", 0)
-        if risk_score >= 7.0:
-            risk_distribution["high"] += 1
-        elif risk_score >= 4.0:
-            risk_distribution["medium"] += 1
-        else:
-            risk_distribution["low"] += 1
+    risk_distribution = {
+        "low": total_prs - high_band - medium_band,
+        "medium": medium_band,
+        "high": high_band
+    }
     
     return {
         "total_prs": total_prs,
@@ -324,6 +342,9 @@ def direct_pr_count(repo: str, start: int, end: int, author: Optional[str] = Non
         }
     }
 
+# Risk-score cut-offs tried (highest first) to shrink the top-by-risk fetch
+TOP_RISK_THRESHOLDS = (7.0, 4.0)
+
 def direct_top_prs_by_risk(repo: str, start: int, end: int, limit: int = 10) -> List[Dict[str, Any]]:
     """
     Get top PRs by risk score.
@@ -338,7 +359,18 @@ def direct_top_prs_by_risk(repo: str, start: int, end: int, limit: int = 10) ->
         List of high-risk PRs
     """
     # Build expression
-    expr = f'merged_at >= {start} and merged_at <= {end} and repo_name == "{repo}" and is_merged == true'
+    expr = _merged_prs_expr(repo, start, end)
+    
+    # Milvus scalar queries can't sort, so narrow the fetch to the highest risk band
+    # that still holds `limit` PRs; only those rows are transferred and sorted
+    client = get_milvus_client()
+    band_counts = run_concurrently([
+        (client.count_prs, f'{expr} and risk_score >= {threshold}') for threshold in TOP_RISK_THRESHOLDS
+    ])
+    for threshold, count in zip(TOP_RISK_THRESHOLDS, band_counts):
+        if count >= limit:
+            expr = f'{expr} and risk_score >= {threshold}'
+            break
     
     # Query fields
     fields = [
@@ -349,11 +381,17 @@ def direct_top_prs_by_risk(repo: str, start: int, end: int, limit: int = 10) ->
     # Execute query
     rows = query_prs(expr, fields)
     
-    # Sort by risk score (highest first)
-    rows.sort(key=lambda r: r.get("risk_score", 0), reverse=True)
-    
-    # Limit results
-    return rows[:limit]
+    # Highest risk scores first; partial selection instead of a full sort
+    return heapq.nlargest(limit, rows, key=lambda r: r.get("risk_score", 0))
+
+def _sum_lines_by_language(client, expr: str) -> Tuple[int, Dict[str, int]]:
+    """Total lines changed and file count per language, streamed over every matching file"""
+    total_lines = 0
+    language_counts = Counter()
+    for batch in client.query_files_iter(expr, ["language", "lines_changed"]):
+        total_lines += int(np.fromiter((int(row.get("lines_changed") or 0) for row in batch), dtype=np.int64, count=len(batch)).sum())
+        language_counts.update([row.get("language", "unknown") for row in batch])
+    return total_lines, language_counts
 
 def direct_file_changes_summary(repo: str, start: int, end: int) -> Dict[str, Any]:
     """
@@ -368,18 +406,19 @@ def direct_file_changes_summary(repo: str, start: int, end: int) -> Dict[str, An
         Summary of file changes
     """
     # Build expression
-    expr = f'merged_at >= {start} and merged_at <= {end} and repo_name == "{repo}"'
-    
-    # Query fields
-    fields = [
-        "file_id", "language", "lines_changed", "is_binary", 
-        "risk_score_file", "file_risk_reasons"
-    ]
-    
-    # Execute query
-    rows = query_files(expr, fields)
-    
-    if not rows:
+    expr = _window_expr(repo, start, end)
+    
+    # Totals and risk bands are counted server-side; only the two columns that
+    # need summing/grouping are streamed as rows
+    client = get_milvus_client()
+    total_files, high_band, medium_band, (total_lines, language_counts) = run_concurrently([
+        (client.count_files, expr),
+        (client.count_files, f'{expr} and risk_score_file >= 7.0'),
+        (client.count_files, f'{expr} and risk_score_file >= 4.0 and risk_score_file < 7.0'),
+        (_sum_lines_by_language, client, expr),
+    ])
+    
+    if not total_files:
         return {
             "total_files": 0,
             "total_lines_changed": 0,
@@ -387,26 +426,12 @@ def direct_file_changes_summary(repo: str, start: int, end: int) -> Dict[str, An
             "risk_breakdown": {"low": 0, "medium": 0, "high": 0}
         }
     
-    # Calculate statistics
-    total_files = len(rows)
-    total_lines = sum(int(row.get("lines_changed") or 0) for row in rows)
-    
-    # Language breakdown
-    language_counts = defaultdict(int)
-    for row in rows:
-        language = row.get("language", "unknown")
-        language_counts[language] += 1
-    
     # Risk breakdown
-    risk_breakdown = {"low": 0, "medium": 0, "high": 0}
-    for row in rows:
-        risk_score = row.get("risk_score_file", 0)
-        if risk_score >= 7.0:
-            risk_breakdown["high"] += 1
-        elif risk_score >= 4.0:
-            risk_breakdown["medium"] += 1
-        else:
-            risk_breakdown["low"] += 1
+    risk_breakdown = {
+        "low": total_files - high_band - medium_band,
+        "medium": medium_band,
+        "high": high_band
+    }
     
     return {
         "total_files": total_files,
@@ -418,3 +443,29 @@ def direct_file_changes_summary(repo: str, start: int, end: int) -> Dict[str, An
             "end": end
         }
     }
+
+# Async variants for event-loop callers: the handlers block on Milvus gRPC calls,
+# so they run in a worker thread and independent handlers can be awaited together
+async def direct_prs_list_async(*args, **kwargs) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """direct_prs_list off the event loop"""
+    return await asyncio.to_thread(direct_prs_list, *args, **kwargs)
+
+async def direct_features_list_async(*args, **kwargs) -> List[Dict[str, Any]]:
+    """direct_features_list off the event loop"""
+    return await asyncio.to_thread(direct_features_list, *args, **kwargs)
+
+async def direct_top_file_by_lines_async(*args, **kwargs) -> Optional[Dict[str, Any]]:
+    """direct_top_file_by_lines off the event loop"""
+    return await asyncio.to_thread(direct_top_file_by_lines, *args, **kwargs)
+
+async def direct_pr_count_async(*args, **kwargs) -> Dict[str, Any]:
+    """direct_pr_count off the event loop"""
+    return await asyncio.to_thread(direct_pr_count, *args, **kwargs)
+
+async def direct_top_prs_by_risk_async(*args, **kwargs) -> List[Dict[str, Any]]:
+    """direct_top_prs_by_risk off the event loop"""
+    return await asyncio.to_thread(direct_top_prs_by_risk, *args, **kwargs)
+
+async def direct_file_changes_summary_async(*args, **kwargs) -> Dict[str, Any]:
+    """direct_file_changes_summary off the event loop"""
+    return await asyncio.to_thread(direct_file_changes_summary, *args, **kwargs)
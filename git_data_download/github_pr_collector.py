@@ -1,18 +1,244 @@
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import argparse
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import time
-import base64
+import binascii
+import functools
+import hashlib
 import re
+import sqlite3
+import threading
+import types
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 
-# Try to import openai, but don't fail if it's not available
+# orjson parses large API payloads (e.g. files lists of big PRs) several times
+# faster than the stdlib json module; fall back to json when it isn't installed
 try:
-    import openai
+    import orjson
 except ImportError:
-    openai = None
+    orjson = None
+
+# PRs processed concurrently
+MAX_CONCURRENCY = int(os.getenv('GITHUB_MAX_CONCURRENCY', '10'))
+
+# Below this many remaining requests, spread the rest evenly until the window resets
+RATE_LIMIT_LOW_WATER = 50
+RATE_LIMIT_RETRIES = 3
+
+# OpenAI requests in flight at once, shared by all PR workers
+LLM_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', '8'))
+
+# Compiled once instead of on every call. A maximal run of \w is always bounded
+# by \b, so r'\w+' counts the same words as r'\b\w+\b' with less backtracking
+_WORD_RE = re.compile(r'\w+')
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+_PAGE_PARAM_RE = re.compile(r'[?&]page=(\d+)')
+
+# Diffs sent for file summaries are cut to this many characters (head + tail)
+SUMMARY_DIFF_CHARS = 6000
+SUMMARY_DIFF_HEAD_CHARS = 4000
+
+# Lock files, minified bundles and source maps: summarizing their diff is noise
+GENERATED_FILE_SUFFIXES = ('.lock', '.min.js', '.map', 'package-lock.json')
+# Files changing more lines than this are not fetched or summarized
+MAX_SUMMARY_CHANGES = 5000
+SKIPPED_SUMMARY = "Summary skipped (binary, generated or too large)"
+
+# PR details fetched per GraphQL query (one aliased pullRequest field each)
+GRAPHQL_PR_BATCH = 25
+PR_DETAILS_QUERY_FIELDS = """
+    number additions deletions changedFiles mergedAt baseRefName headRefName
+    mergeable mergeStateStatus
+    commits { totalCount }
+    comments { totalCount }
+    reviews(first: 100) { nodes { comments { totalCount } } }
+    mergedBy { login }
+    mergeCommit { oid }
+"""
+# mergeStateStatus is still behind the merge-info schema preview
+GRAPHQL_ACCEPT = 'application/vnd.github.merge-info-preview+json'
+
+# File contents kept in memory for the run, so files touched by many PRs are fetched once
+CONTENT_CACHE_SIZE = 512
+
+# On-disk caches (HTTP ETags, LLM replies) live here between runs
+CACHE_DIR = os.getenv('COLLECTOR_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+# HTTP and LLM cache entries older than this are purged when the cache is opened
+CACHE_MAX_AGE_DAYS = float(os.getenv('COLLECTOR_CACHE_MAX_AGE_DAYS', '30'))
+
+
+# File classification tables, built once at import (the mappings are read-only)
+LANGUAGE_BY_EXTENSION = types.MappingProxyType({
+    '.py': 'Python', '.js': 'JavaScript', '.ts': 'TypeScript', '.java': 'Java',
+    '.cpp': 'C++', '.c': 'C', '.cs': 'C#', '.php': 'PHP', '.rb': 'Ruby',
+    '.go': 'Go', '.rs': 'Rust', '.swift': 'Swift', '.kt': 'Kotlin',
+    '.scala': 'Scala', '.clj': 'Clojure', '.hs': 'Haskell', '.ml': 'OCaml',
+    '.html': 'HTML', '.css': 'CSS', '.scss': 'SCSS', '.sass': 'Sass',
+    '.sql': 'SQL', '.r': 'R', '.m': 'MATLAB', '.sh': 'Shell',
+    '.yaml': 'YAML', '.yml': 'YAML', '.json': 'JSON', '.xml': 'XML',
+    '.md': 'Markdown', '.txt': 'Text', '.rst': 'reStructuredText',
+    '.dockerfile': 'Dockerfile', '.dockerignore': 'Docker',
+    '.gitignore': 'Git', '.gitattributes': 'Git'
+})
+BINARY_EXTENSIONS = frozenset({
+    '.exe', '.dll', '.so', '.dylib', '.bin', '.dat', '.zip',
+    '.tar', '.gz', '.rar', '.7z', '.png', '.jpg', '.jpeg',
+    '.gif', '.bmp', '.ico', '.pdf', '.doc', '.docx', '.xls',
+    '.xlsx', '.ppt', '.pptx', '.mp3', '.mp4', '.avi', '.mov'
+})
+SOURCE_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.java', '.cpp', '.c', '.cs', '.php',
+    '.rb', '.go', '.rs', '.swift', '.kt', '.scala', '.clj',
+    '.hs', '.ml', '.html', '.css', '.scss', '.sql', '.r', '.sh'
+})
+DOC_EXTENSIONS = frozenset({'.md', '.rst', '.txt', '.pdf', '.doc', '.docx'})
+# Substring patterns matched against the lower-cased path
+CONFIG_PATTERNS = ('config', 'conf', 'ini', 'cfg', 'properties', 'env',
+                   'dockerfile', 'docker-compose', 'package.json', 'requirements.txt',
+                   'pom.xml', 'build.gradle', 'cargo.toml', 'go.mod', 'composer.json')
+DOC_PATTERNS = ('readme', 'license', 'changelog', 'contributing', 'docs/', 'documentation/')
+TEST_PATTERNS = ('test', 'spec', 'specs', 'test_', '_test', 'tests/', 'specs/')
+CHANGE_TYPES = types.MappingProxyType({
+    'added': 'Added',
+    'modified': 'Modified',
+    'removed': 'Removed',
+    'renamed': 'Renamed'
+})
+
+
+def _classify_file(filename: str) -> Dict[str, Any]:
+    """Language, extension and kind flags for a path, from one extension lookup"""
+    # Not os.path.splitext: dotfiles such as .gitignore must keep their "extension"
+    extension = '.' + filename.rpartition('.')[2] if '.' in filename else ''
+    ext = extension.lower()
+    path = filename.lower()
+    is_test_file = any(pattern in path for pattern in TEST_PATTERNS)
+    is_config_file = any(pattern in path for pattern in CONFIG_PATTERNS)
+    return {
+        'language': LANGUAGE_BY_EXTENSION.get(ext, 'Unknown'),
+        'file_extension': extension,
+        'is_binary': ext in BINARY_EXTENSIONS,
+        'is_config_file': is_config_file,
+        'is_documentation': ext in DOC_EXTENSIONS or any(pattern in path for pattern in DOC_PATTERNS),
+        'is_test_file': is_test_file,
+        'is_source_code': ext in SOURCE_EXTENSIONS and not is_test_file and not is_config_file
+    }
+
+
+def _skip_file_contents(file_info: Dict[str, Any]) -> bool:
+    """True for binary, generated or very large files, whose contents and summaries aren't worth fetching"""
+    return (file_info.get('is_binary', False)
+            or (file_info.get('changes') or 0) > MAX_SUMMARY_CHANGES
+            or (file_info.get('filename') or '').endswith(GENERATED_FILE_SUFFIXES))
+
+
+def _has_api_errors(pr_data: Dict[str, Any]) -> bool:
+    """True if any part of a processed PR records a failed GitHub or OpenAI call"""
+    def failed(text):
+        return isinstance(text, str) and text.startswith('Error ')
+    
+    files = pr_data.get('files') or []
+    if pr_data.get('changed_files') and not files:
+        return True  # The files listing failed
+    if failed(pr_data.get('pr_summary')):
+        return True
+    for file_info in files:
+        content_error = file_info.get('content_error')
+        if content_error and not content_error.endswith('File not found'):
+            return True
+        if failed(file_info.get('ai_summary')):
+            return True
+        if any(failed(reason) for reason in (file_info.get('risk_assessment') or {}).get('reasons') or []):
+            return True
+    return False
+
+
+def _json_loads(data):
+    """Parse JSON from str or bytes, with orjson when available"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _json_dumps(obj) -> str:
+    """Serialize to a compact JSON string, with orjson when available"""
+    return orjson.dumps(obj).decode('utf-8') if orjson else json.dumps(obj)
+
+
+def _truncate_middle(text: str, limit: int = SUMMARY_DIFF_CHARS, head: int = SUMMARY_DIFF_HEAD_CHARS) -> str:
+    """Keep the first `head` and last `limit - head` characters of text longer than `limit`"""
+    if not text or len(text) <= limit:
+        return text
+    return text[:head] + "\n...[truncated]...\n" + text[-(limit - head):]
+
+
+class LRUCache:
+    """Thread-safe bounded mapping that evicts the least recently used entry"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+class SqliteCache:
+    """
+    Thread-safe string key/value store persisted in a sqlite file
+    
+    With max_age_days, entries written longer ago than that are deleted on open,
+    so a cache used across many runs doesn't grow without bound.
+    """
+
+    def __init__(self, path: str, max_age_days: Optional[float] = None):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, stored_at REAL)')
+            columns = {row[1] for row in self._conn.execute('PRAGMA table_info(cache)')}
+            if 'stored_at' not in columns:
+                # Caches written before entries were timestamped; their rows count as expired
+                self._conn.execute('ALTER TABLE cache ADD COLUMN stored_at REAL')
+            if max_age_days is not None:
+                cutoff = time.time() - max_age_days * 86400
+                purged = self._conn.execute(
+                    'DELETE FROM cache WHERE stored_at IS NULL OR stored_at < ?', (cutoff,)
+                ).rowcount
+                if purged:
+                    print(f"Purged {purged} expired entries from {os.path.basename(path)}")
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM cache WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO cache (key, value, stored_at) VALUES (?, ?, ?)',
+                               (key, value, time.time()))
+            self._conn.commit()
+
 
 class GitHubPRCollector:
     def __init__(self, github_token: str):
@@ -29,24 +255,190 @@ class GitHubPRCollector:
         }
         self.base_url = 'https://api.github.com'
         
-        # Initialize OpenAI client if API key is available
-        self.openai_client = None
+        # One pooled session shared by all workers: keep-alive connections instead of
+        # a TCP+TLS handshake per request, plus retries on transient server errors.
+        # 429s are left to _handle_rate_limit, which waits on GitHub's headers once
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=max(20, MAX_CONCURRENCY),
+            max_retries=Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504],
+                              raise_on_status=False)
+        )
+        self.session.mount('https://', adapter)
+        self._http_cache = SqliteCache(os.path.join(CACHE_DIR, 'http_cache.sqlite'), CACHE_MAX_AGE_DAYS)
+        self._llm_cache = SqliteCache(os.path.join(CACHE_DIR, 'llm_cache.sqlite'), CACHE_MAX_AGE_DAYS)
+        self._llm_pool = ThreadPoolExecutor(max_workers=LLM_CONCURRENCY)
+        self._content_cache = LRUCache(CONTENT_CACHE_SIZE)
+        self._repo_info = {}
+        
+        # Rate-limit pacing is shared by all worker threads: each request reserves the
+        # next send slot, spaced _request_interval apart (0 while quota is plentiful)
+        self._rate_lock = threading.Lock()
+        self._next_request_at = 0.0
+        self._request_interval = 0.0
+        self._checkpoint = SqliteCache(os.path.join(CACHE_DIR, 'prs.sqlite'))
+        
+    @functools.cached_property
+    def openai_client(self):
+        """
+        OpenAI client, created on first use; None when no API key or library is available
+        
+        The openai package is only imported here, so runs without an API key
+        never pay for importing it.
+        """
         openai_api_key = os.getenv('OPENAI_API_KEY')
-        if openai_api_key:
-            try:
-                # Use the newer OpenAI client
-                from openai import OpenAI
-                self.openai_client = OpenAI(api_key=openai_api_key)
-                print("[PASS] OpenAI client initialized successfully")
-            except ImportError:
-                # Fallback to older openai library
-                openai.api_key = openai_api_key
-                self.openai_client = openai
-                print("[PASS] OpenAI client initialized (legacy mode)")
-        else:
+        if not openai_api_key:
             print("Warning: OPENAI_API_KEY not found. File summaries will not be generated.")
+            return None
+        try:
+            # Use the newer OpenAI client
+            from openai import OpenAI
+            print("[PASS] OpenAI client initialized successfully")
+            return OpenAI(api_key=openai_api_key)
+        except ImportError:
+            pass
+        try:
+            # Fallback to older openai library
+            import openai
+        except ImportError:
+            print("Warning: openai package not installed. File summaries will not be generated.")
+            return None
+        openai.api_key = openai_api_key
+        print("[PASS] OpenAI client initialized (legacy mode)")
+        return openai
     
-    def _generate_file_summary(self, filename: str, pre_content: str, post_content: str, diff: str, language: str) -> str:
+    def _get(self, url: str, params: Dict[str, Any] = None, headers: Dict[str, str] = None) -> requests.Response:
+        """GET a GitHub API URL, pacing and retrying on GitHub's rate-limit headers"""
+        for _ in range(RATE_LIMIT_RETRIES):
+            self._wait_for_turn()
+            response = self.session.get(url, headers=headers, params=params)
+            if not self._handle_rate_limit(response):
+                break
+        return response
+    
+    def _wait_for_turn(self):
+        """Sleep until this thread's next GitHub request is due under the shared pacing"""
+        with self._rate_lock:
+            now = time.monotonic()
+            send_at = max(now, self._next_request_at)
+            self._next_request_at = send_at + self._request_interval
+        if send_at > now:
+            time.sleep(send_at - now)
+    
+    def _handle_rate_limit(self, response: requests.Response) -> bool:
+        """
+        Update the shared pacing from GitHub's rate-limit headers
+        
+        Nothing changes while plenty of quota remains. Below RATE_LIMIT_LOW_WATER
+        the remaining requests (across all threads) are spread over the time left
+        until X-RateLimit-Reset. A 403/429 rate-limit rejection holds every thread
+        back for Retry-After, or until the reset.
+        
+        Args:
+            response (requests.Response): Response to inspect
+            
+        Returns:
+            bool: True if the request was rejected for rate limiting and should be retried
+        """
+        headers = response.headers
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        until_reset = max(0.0, int(reset) - time.time()) if reset else 0.0
+        
+        if response.status_code in (403, 429):
+            if headers.get('Retry-After'):
+                wait = float(headers['Retry-After'])
+            elif remaining == '0':
+                wait = until_reset + 1
+            elif response.status_code == 429:
+                wait = 60  # GitHub's advice for secondary limits without Retry-After
+            else:
+                return False  # A permission error, not rate limiting
+            print(f"Rate limited by GitHub; pausing requests for {wait:.0f}s")
+            with self._rate_lock:
+                self._next_request_at = max(self._next_request_at, time.monotonic() + wait)
+            return True
+        
+        if remaining is not None:
+            remaining = int(remaining)
+            interval = until_reset / max(remaining, 1) if remaining < RATE_LIMIT_LOW_WATER else 0.0
+            with self._rate_lock:
+                self._request_interval = interval
+        return False
+    
+    def _get_text(self, url: str, params: Dict[str, Any] = None, accept: str = None) -> str:
+        """
+        GET a GitHub API URL and return the response body as text
+        
+        Bodies that come with an ETag are kept in the on-disk HTTP cache. Later
+        requests for the same URL send If-None-Match, and a 304 (which does not
+        count against the rate limit) is answered from the cache.
+        
+        Args:
+            url (str): API URL
+            params (Dict[str, Any], optional): Query parameters
+            accept (str, optional): Media type overriding the default JSON one
+        """
+        headers = {'Accept': accept} if accept else {}
+        key = requests.Request('GET', url, params=params).prepare().url
+        if accept:
+            key = f"{key} {accept}"
+        cached = self._http_cache.get(key)
+        if cached:
+            cached = _json_loads(cached)
+            response = self._get(url, params, {**headers, 'If-None-Match': cached['etag']})
+            if response.status_code == 304:
+                return cached['body']
+        else:
+            response = self._get(url, params, headers)
+        response.raise_for_status()
+        
+        body = response.content.decode('utf-8', errors='ignore')
+        etag = response.headers.get('ETag')
+        if etag:
+            self._http_cache.set(key, _json_dumps({'etag': etag, 'body': body}))
+        return body
+    
+    def _get_json(self, url: str, params: Dict[str, Any] = None) -> Any:
+        """GET a GitHub API URL and return the decoded JSON body (ETag-cached)"""
+        return _json_loads(self._get_text(url, params))
+    
+    def _chat_completion(self, system_prompt: str, prompt: str, max_tokens: int, temperature: float,
+                         model: str = "gpt-4o-mini") -> str:
+        """
+        Run a chat completion and return the stripped reply text
+        
+        Replies are cached on disk under a SHA-256 of (model, system prompt, user
+        prompt), so identical prompts on re-runs or across PRs skip the API call.
+        API errors propagate to the caller and are never cached.
+        """
+        key = hashlib.sha256('\0'.join((model, system_prompt, prompt)).encode('utf-8')).hexdigest()
+        cached = self._llm_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+        if hasattr(self.openai_client, 'chat'):
+            # Newer OpenAI client
+            response = self.openai_client.chat.completions.create(
+                model=model, messages=messages, max_tokens=max_tokens, temperature=temperature
+            )
+        else:
+            # Fallback to older openai library
+            response = self.openai_client.ChatCompletion.create(
+                model=model, messages=messages, max_tokens=max_tokens, temperature=temperature
+            )
+        reply = response.choices[0].message.content.strip()
+        self._llm_cache.set(key, reply)
+        return reply
+    
+    def _generate_file_summary(self, filename: str, pre_content: str, post_content: str, diff: str, language: str,
+                               is_binary: bool = False) -> str:
         """
         Generate a summary of file changes using LLM
         
@@ -56,6 +448,7 @@ class GitHubPRCollector:
             post_content (str): Content after changes
             diff (str): Git diff/patch
             language (str): Programming language
+            is_binary (bool): Binary files are not summarized
             
         Returns:
             str: Generated summary
@@ -63,7 +456,13 @@ class GitHubPRCollector:
         if not self.openai_client:
             return "Summary not available (OpenAI API key not configured)"
         
+        if is_binary or filename.endswith(GENERATED_FILE_SUFFIXES):
+            return SKIPPED_SUMMARY
+        
         try:
+            # Jumbo diffs add tokens and latency without improving a 2-3 sentence summary
+            diff = _truncate_middle(diff)
+            
             # Prepare the prompt for the LLM
             prompt = f"""
             Analyze the changes made to the file '{filename}' (Language: {language}).
@@ -81,30 +480,12 @@ class GitHubPRCollector:
             
             # Call OpenAI API
             try:
-                # Try newer OpenAI client first
-                if hasattr(self.openai_client, 'chat'):
-                    response = self.openai_client.chat.completions.create(
-                        model="gpt-4o-mini",
-                        messages=[
-                            {"role": "system", "content": "You are a helpful assistant that analyzes code changes and provides concise summaries."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        max_tokens=200,
-                        temperature=0.3
-                    )
-                    summary = response.choices[0].message.content.strip()
-                else:
-                    # Fallback to older openai library
-                    response = self.openai_client.ChatCompletion.create(
-                        model="gpt-4o-mini",
-                        messages=[
-                            {"role": "system", "content": "You are a helpful assistant that analyzes code changes and provides concise summaries."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        max_tokens=200,
-                        temperature=0.3
-                    )
-                    summary = response.choices[0].message.content.strip()
+                summary = self._chat_completion(
+                    "You are a helpful assistant that analyzes code changes and provides concise summaries.",
+                    prompt,
+                    max_tokens=200,
+                    temperature=0.3
+                )
             except Exception as api_error:
                 print(f"OpenAI API error: {api_error}")
                 return f"Error calling OpenAI API: {str(api_error)}"
@@ -113,7 +494,8 @@ class GitHubPRCollector:
         except Exception as e:
             return f"Error generating summary: {str(e)}"
     
-    def get_repo_pull_requests(self, repo_name: str, state: str = 'all', max_prs: int = None) -> List[Dict[str, Any]]:
+    def get_repo_pull_requests(self, repo_name: str, state: str = 'all', max_prs: int = None,
+                               resume: bool = True) -> List[Dict[str, Any]]:
         """
         Fetch pull requests for a given repository
         
@@ -121,70 +503,191 @@ class GitHubPRCollector:
             repo_name (str): Repository name in format 'owner/repo'
             state (str): PR state filter ('open', 'closed', 'all')
             max_prs (int, optional): Maximum number of PRs to fetch. If None, fetches all PRs.
+            resume (bool): Reuse PRs checkpointed by an earlier run (see iter_repo_pull_requests)
             
         Returns:
             List[Dict[str, Any]]: List of pull request data
         """
-        all_prs = []
-        page = 1
+        all_prs = list(self.iter_repo_pull_requests(repo_name, state, max_prs, resume))
+        print(f"Total PRs collected: {len(all_prs)}")
+        return all_prs
+    
+    def iter_repo_pull_requests(self, repo_name: str, state: str = 'all', max_prs: int = None,
+                                resume: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Yield processed pull requests for a given repository, newest first
+        
+        Every processed PR without failed API calls is checkpointed to
+        COLLECTOR_CACHE_DIR/prs.sqlite as soon as it is done. With resume, a PR whose
+        updated_at still matches its checkpoint (and that was processed with the same
+        LLM availability) is loaded from there instead of being processed again, so an
+        interrupted collection picks up where it stopped.
+        
+        Args:
+            repo_name (str): Repository name in format 'owner/repo'
+            state (str): PR state filter ('open', 'closed', 'all')
+            max_prs (int, optional): Maximum number of PRs to yield. If None, yields all PRs.
+            resume (bool): Reuse checkpointed PRs that haven't changed since
+            
+        Yields:
+            Dict[str, Any]: Pull request data
+        """
+        collected = 0
         per_page = 100  # Maximum allowed by GitHub API
         
         print(f"Fetching pull requests for repository: {repo_name}")
         
-        while True:
-            url = f"{self.base_url}/repos/{repo_name}/pulls"
-            params = {
-                'state': state,
-                'per_page': per_page,
-                'page': page,
-                'sort': 'created',
-                'direction': 'desc'
-            }
-            
-            try:
-                response = requests.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                
-                prs = response.json()
+        # PRs on a page are processed concurrently; each worker fetches the detailed
+        # info, files and contents for its PR while the others wait on the network
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+            pages = self._iter_pr_pages(repo_name, state, per_page, max_prs, executor)
+            for page, prs in pages:
+                print(f"Processing {len(prs)} PRs from page {page} ({MAX_CONCURRENCY} at a time)")
                 
-                if not prs:  # No more PRs to fetch
-                    break
+                # Only submit as many PRs as are still needed to reach max_prs
+                pending = prs
+                while pending and not (max_prs and collected >= max_prs):
+                    batch = pending[:max_prs - collected] if max_prs else pending
+                    pending = pending[len(batch):]
                     
-                # Process each PR and extract required metadata
-                for i, pr in enumerate(prs):
-                    pr_number = pr.get('number', 'unknown')
-                    print(f"Processing PR #{pr_number} ({i+1}/{len(prs)} on page {page})")
-                    try:
-                        pr_data = self._extract_pr_metadata(pr, repo_name)
-                        if pr_data:  # Only add if we got valid data
-                            all_prs.append(pr_data)
-                        else:
-                            print(f"Warning: Could not extract metadata for PR #{pr_number}")
-                    except Exception as e:
-                        print(f"Error processing PR #{pr_number}: {e}")
-                        continue
+                    done = {pr.get('number'): self._load_checkpoint(repo_name, pr) if resume else None
+                            for pr in batch}
+                    todo = [number for number, pr_data in done.items() if pr_data is None]
+                    details = self._get_pr_details_batch(repo_name, todo, executor) if todo else {}
                     
-                    # Check if we've reached the maximum number of PRs
-                    if max_prs and len(all_prs) >= max_prs:
-                        print(f"Reached maximum PR limit ({max_prs}). Stopping fetch.")
-                        break
-                
-                # Check if we've reached the last page or max PRs
-                if len(prs) < per_page or (max_prs and len(all_prs) >= max_prs):
-                    break
+                    def process(pr):
+                        pr_data = done[pr.get('number')]
+                        if pr_data is None:
+                            pr_data = self._process_pr(pr, repo_name, details.get(pr.get('number')))
+                            # PRs with failed calls are redone next run rather than frozen
+                            if pr_data and not _has_api_errors(pr_data):
+                                self._save_checkpoint(repo_name, pr, pr_data)
+                        return pr_data
                     
-                page += 1
+                    for pr_data in executor.map(process, batch):
+                        if pr_data:
+                            collected += 1
+                            yield pr_data
                 
-                # Rate limiting: GitHub allows 5000 requests per hour for authenticated users
-                # We'll add a small delay to be respectful
-                time.sleep(0.1)
-                
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching PRs: {e}")
-                break
-                
-        print(f"Total PRs collected: {len(all_prs)}")
-        return all_prs
+                if max_prs and collected >= max_prs:
+                    print(f"Reached maximum PR limit ({max_prs}). Stopping fetch.")
+                    break
+            pages.close()
+    
+    def _load_checkpoint(self, repo_name: str, pr: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Return the checkpointed data for a listed PR, if it hasn't been updated since
+        and was processed with the same LLM availability as this run
+        """
+        cached = self._checkpoint.get(f"{repo_name}#{pr.get('number')}")
+        if cached is None:
+            return None
+        cached = _json_loads(cached)
+        if cached.get('updated_at') != pr.get('updated_at') or cached.get('llm') != bool(self.openai_client):
+            return None
+        print(f"Resuming PR #{pr.get('number')} from checkpoint")
+        return cached['pr']
+    
+    def _save_checkpoint(self, repo_name: str, pr: Dict[str, Any], pr_data: Dict[str, Any]):
+        """Checkpoint a processed PR, keyed by repo and number"""
+        self._checkpoint.set(
+            f"{repo_name}#{pr.get('number')}",
+            _json_dumps({'updated_at': pr.get('updated_at'), 'llm': bool(self.openai_client), 'pr': pr_data})
+        )
+    
+    def _iter_pr_pages(self, repo_name: str, state: str, per_page: int, max_prs: int,
+                       executor: ThreadPoolExecutor) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Yield (page, prs) for the PR listing in page order
+        
+        Page 1 is fetched first; its Link rel="last" header gives the page count, so
+        the remaining pages (only as many as max_prs needs) are prefetched in parallel,
+        at most MAX_CONCURRENCY pages ahead of the one being yielded so PR work isn't
+        queued behind the whole listing. Pages past the max_prs bound are fetched one
+        at a time if the caller keeps iterating.
+        
+        Args:
+            repo_name (str): Repository name in format 'owner/repo'
+            state (str): PR state filter ('open', 'closed', 'all')
+            per_page (int): PRs per listing page
+            max_prs (int, optional): Maximum number of PRs the caller needs
+            executor (ThreadPoolExecutor): Pool used for the parallel page fetches
+        """
+        url = f"{self.base_url}/repos/{repo_name}/pulls"
+        params = {
+            'state': state,
+            'per_page': per_page,
+            'sort': 'created',
+            'direction': 'desc'
+        }
+        
+        try:
+            response = self._get(url, {**params, 'page': 1})
+            response.raise_for_status()
+            prs = _json_loads(response.content)
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching PRs: {e}")
+            return
+        if not prs:
+            return
+        yield 1, prs
+        
+        last_url = response.links.get('last', {}).get('url', '')
+        match = _PAGE_PARAM_RE.search(last_url)
+        last_page = int(match.group(1)) if match else 1
+        prefetch_to = last_page
+        if max_prs:
+            prefetch_to = min(last_page, -(-max_prs // per_page))
+        
+        futures = deque()  # In page order, starting at the next page to yield
+        next_page = 2
+        
+        def prefetch():
+            nonlocal next_page
+            while next_page <= prefetch_to and len(futures) < MAX_CONCURRENCY:
+                futures.append(executor.submit(self._get_json, url, {**params, 'page': next_page}))
+                next_page += 1
+        
+        try:
+            prefetch()
+            for page in range(2, last_page + 1):
+                if page <= prefetch_to:
+                    prs = futures.popleft().result()
+                    prefetch()
+                else:
+                    prs = self._get_json(url, {**params, 'page': page})
+                if not prs:
+                    return
+                yield page, prs
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching PRs: {e}")
+        finally:
+            for future in futures:
+                future.cancel()
+    
+    def _process_pr(self, pr: Dict[str, Any], repo_name: str, detailed_pr: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Extract metadata for one PR from a listing page, logging instead of raising
+        
+        Args:
+            pr (Dict[str, Any]): Raw PR data from GitHub API
+            repo_name (str): Repository name in format 'owner/repo'
+            detailed_pr (Dict[str, Any], optional): Prefetched detailed PR information
+            
+        Returns:
+            Dict[str, Any]: Extracted metadata, or None if it could not be extracted
+        """
+        pr_number = pr.get('number', 'unknown')
+        print(f"Processing PR #{pr_number}")
+        try:
+            pr_data = self._extract_pr_metadata(pr, repo_name, detailed_pr)
+        except Exception as e:
+            print(f"Error processing PR #{pr_number}: {e}")
+            return None
+        if not pr_data:
+            print(f"Warning: Could not extract metadata for PR #{pr_number}")
+            return None
+        return pr_data
     
     def get_specific_pr(self, repo_name: str, pr_number: int) -> Dict[str, Any]:
         """
@@ -212,7 +715,7 @@ class GitHubPRCollector:
         
         # Extract metadata using the same method as get_repo_pull_requests
         try:
-            pr_data = self._extract_pr_metadata(mock_pr, repo_name)
+            pr_data = self._extract_pr_metadata(mock_pr, repo_name, detailed_pr)
             return pr_data
         except Exception as e:
             print(f"Error extracting metadata for PR #{pr_number}: {e}")
@@ -228,20 +731,109 @@ class GitHubPRCollector:
         Returns:
             Dict[str, Any]: Repository information
         """
+        # Every PR of a run needs the same repo_id; fetch it once
+        if repo_name in self._repo_info:
+            return self._repo_info[repo_name]
+        
         url = f"{self.base_url}/repos/{repo_name}"
         
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            
-            # Add a small delay to respect rate limits
-            time.sleep(0.1)
-            
-            return response.json()
-            
+            repo_info = self._get_json(url)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching repository info for {repo_name}: {e}")
             return {}
+        
+        self._repo_info[repo_name] = repo_info
+        return repo_info
+    
+    def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a GitHub GraphQL query and return its data
+        
+        Errors alongside partial data (e.g. one inaccessible aliased field) are
+        logged and the partial data returned; the failed fields come back null.
+        
+        Raises:
+            requests.exceptions.RequestException: On HTTP errors
+            ValueError: If the response reports GraphQL errors and no data
+        """
+        url = f"{self.base_url}/graphql"
+        for _ in range(RATE_LIMIT_RETRIES):
+            self._wait_for_turn()
+            response = self.session.post(url, json={'query': query, 'variables': variables},
+                                         headers={'Accept': GRAPHQL_ACCEPT})
+            if not self._handle_rate_limit(response):
+                break
+        response.raise_for_status()
+        body = _json_loads(response.content)
+        errors = body.get('errors')
+        data = body.get('data')
+        if errors:
+            message = errors[0].get('message', 'GraphQL error')
+            if not data:
+                raise ValueError(message)
+            print(f"GraphQL query returned {len(errors)} error(s), using partial data: {message}")
+        return data or {}
+    
+    def _get_pr_details_batch(self, repo_name: str, pr_numbers: List[int],
+                              executor: ThreadPoolExecutor) -> Dict[int, Dict[str, Any]]:
+        """
+        Fetch detailed info for many PRs with aliased GraphQL queries
+        
+        One query covers GRAPHQL_PR_BATCH PRs instead of one REST call each. The
+        result is shaped like the REST detailed-PR fields the collector reads.
+        PRs missing or null in the result (or a failed query) fall back to REST later.
+        
+        Args:
+            repo_name (str): Repository name in format 'owner/repo'
+            pr_numbers (List[int]): Pull request numbers
+            executor (ThreadPoolExecutor): Pool the batch queries run on
+            
+        Returns:
+            Dict[int, Dict[str, Any]]: Detailed PR information keyed by PR number
+        """
+        owner, _, name = repo_name.partition('/')
+        numbers = [n for n in pr_numbers if isinstance(n, int)]
+        chunks = [numbers[i:i + GRAPHQL_PR_BATCH] for i in range(0, len(numbers), GRAPHQL_PR_BATCH)]
+        
+        def fetch(chunk):
+            fields = '\n'.join(f"pr{n}: pullRequest(number: {n}) {{ {PR_DETAILS_QUERY_FIELDS} }}" for n in chunk)
+            query = f"query($owner: String!, $name: String!) {{ repository(owner: $owner, name: $name) {{ {fields} }} }}"
+            try:
+                return self._graphql(query, {'owner': owner, 'name': name}).get('repository') or {}
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"GraphQL PR details failed, falling back to REST: {e}")
+                return {}
+        
+        details = {}
+        for nodes in executor.map(fetch, chunks):
+            for node in nodes.values():
+                if node:
+                    details[node['number']] = self._rest_shaped_pr_details(node)
+        return details
+    
+    @staticmethod
+    def _rest_shaped_pr_details(node: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a GraphQL PullRequest node onto the REST detailed-PR fields the collector reads"""
+        merged_by = node.get('mergedBy')
+        merge_commit = node.get('mergeCommit')
+        reviews = (node.get('reviews') or {}).get('nodes') or []
+        return {
+            'number': node.get('number'),
+            'additions': node.get('additions', 0),
+            'deletions': node.get('deletions', 0),
+            'changed_files': node.get('changedFiles', 0),
+            'commits': (node.get('commits') or {}).get('totalCount', 0),
+            'comments': (node.get('comments') or {}).get('totalCount', 0),
+            'review_comments': sum((r.get('comments') or {}).get('totalCount', 0) for r in reviews),
+            'mergeable': {'MERGEABLE': True, 'CONFLICTING': False}.get(node.get('mergeable')),
+            'mergeable_state': (node.get('mergeStateStatus') or 'unknown').lower(),
+            'merged_by': {'login': merged_by.get('login')} if merged_by else None,
+            'merge_commit_sha': merge_commit.get('oid') if merge_commit else None,
+            'merged_at': node.get('mergedAt'),
+            'base': {'ref': node.get('baseRefName')},
+            'head': {'ref': node.get('headRefName')}
+        }
     
     def _get_detailed_pr_info(self, repo_name: str, pr_number: int) -> Dict[str, Any]:
         """
@@ -257,13 +849,7 @@ class GitHubPRCollector:
         url = f"{self.base_url}/repos/{repo_name}/pulls/{pr_number}"
         
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            
-            # Add a small delay to respect rate limits
-            time.sleep(0.1)
-            
-            return response.json()
+            return self._get_json(url)
             
         except requests.exceptions.RequestException as e:
             print(f"Error fetching detailed info for PR #{pr_number}: {e}")
@@ -283,13 +869,7 @@ class GitHubPRCollector:
         url = f"{self.base_url}/repos/{repo_name}/pulls/{pr_number}/files"
         
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            
-            # Add a small delay to respect rate limits
-            time.sleep(0.1)
-            
-            files_data = response.json()
+            files_data = self._get_json(url)
             
             # Check if this is a very large PR that might cause issues
             if len(files_data) > 1000:
@@ -298,7 +878,9 @@ class GitHubPRCollector:
             
             # Process each file to extract detailed metadata
             processed_files = []
-            for i, file_data in enumerate(files_data):
+            for file_data in files_data:
+                status = file_data.get('status', '')
+                kind = _classify_file(file_data.get('filename', ''))
                 file_info = {
                     'sha': file_data.get('sha'),
                     'filename': file_data.get('filename'),
@@ -312,28 +894,29 @@ class GitHubPRCollector:
                     'patch': file_data.get('patch'),
                     'previous_filename': file_data.get('previous_filename'),
                     'size': file_data.get('size', 0),
-                    'language': self._detect_language(file_data.get('filename', '')),
-                    'file_extension': self._get_file_extension(file_data.get('filename', '')),
-                    'is_binary': self._is_binary_file(file_data.get('filename', '')),
-                    'is_config_file': self._is_config_file(file_data.get('filename', '')),
-                    'is_documentation': self._is_documentation_file(file_data.get('filename', '')),
-                    'is_test_file': self._is_test_file(file_data.get('filename', '')),
-                    'is_source_code': self._is_source_code_file(file_data.get('filename', '')),
-                    'change_type': self._get_change_type(file_data.get('status', '')),
+                    'language': kind['language'],
+                    'file_extension': kind['file_extension'],
+                    'is_binary': kind['is_binary'],
+                    'is_config_file': kind['is_config_file'],
+                    'is_documentation': kind['is_documentation'],
+                    'is_test_file': kind['is_test_file'],
+                    'is_source_code': kind['is_source_code'],
+                    'change_type': CHANGE_TYPES.get(status, status.capitalize()),
                     'lines_added': file_data.get('additions', 0),
                     'lines_deleted': file_data.get('deletions', 0),
                     'lines_changed': file_data.get('changes', 0),
                     'net_lines': (file_data.get('additions', 0) - file_data.get('deletions', 0))
                 }
-                
-                # Generate risk assessment for all files
-                if self.openai_client:
-                    file_info['risk_assessment'] = self._generate_file_risk_assessment(
-                        repo_name, pr_number, file_info
-                    )
-                
                 processed_files.append(file_info)
             
+            # Generate risk assessments for all files in parallel
+            if self.openai_client:
+                assessments = self._llm_pool.map(
+                    lambda f: self._generate_file_risk_assessment(repo_name, pr_number, f), processed_files
+                )
+                for file_info, risk_assessment in zip(processed_files, assessments):
+                    file_info['risk_assessment'] = risk_assessment
+            
             return processed_files
             
         except requests.exceptions.RequestException as e:
@@ -352,25 +935,22 @@ class GitHubPRCollector:
         Returns:
             Dict[str, Any]: File content information
         """
+        # Successful lookups are reused for the rest of the run (e.g. the base-branch
+        # version of a file touched by several PRs); callers get their own copy
+        cache_key = ('contents', repo_name, file_path, ref)
+        cached = self._content_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+        
         url = f"{self.base_url}/repos/{repo_name}/contents/{file_path}"
         params = {'ref': ref}
         
         try:
-            response = requests.get(url, headers=self.headers, params=params)
-            
-            if response.status_code == 404:
-                return {'content': None, 'encoding': None, 'size': 0, 'error': 'File not found'}
-            
-            response.raise_for_status()
-            
-            # Add a small delay to respect rate limits
-            time.sleep(0.1)
-            
-            content_data = response.json()
+            content_data = self._get_json(url, params)
             
             # Handle single file response
             if isinstance(content_data, dict) and 'content' in content_data:
-                return {
+                result = {
                     'content': content_data.get('content'),
                     'encoding': content_data.get('encoding'),
                     'size': content_data.get('size', 0),
@@ -378,18 +958,54 @@ class GitHubPRCollector:
                     'url': content_data.get('url'),
                     'download_url': content_data.get('download_url')
                 }
+                self._content_cache.set(cache_key, result)
+                return dict(result)
             
             return {'content': None, 'encoding': None, 'size': 0, 'error': 'Unexpected response format'}
             
         except requests.exceptions.RequestException as e:
+            if getattr(e.response, 'status_code', None) == 404:
+                return {'content': None, 'encoding': None, 'size': 0, 'error': 'File not found'}
+            return {'content': None, 'encoding': None, 'size': 0, 'error': str(e)}
+    
+    def _get_blob_contents(self, repo_name: str, sha: str) -> Dict[str, Any]:
+        """
+        Fetch a file's text by its blob SHA
+        
+        Blobs are content-addressed, so the SHA alone is a safe cache key: a file
+        version shared by several PRs (lock files, configs) is fetched once per run.
+        The raw media type returns the file itself, with no JSON wrapper or base64.
+        
+        Args:
+            repo_name (str): Repository name in format 'owner/repo'
+            sha (str): Blob SHA from _get_pr_files
+            
+        Returns:
+            Dict[str, Any]: 'decoded_content', 'size' and 'sha', or 'error' like _get_file_contents
+        """
+        cached = self._content_cache.get(('blob', sha))
+        if cached is not None:
+            return dict(cached)
+        
+        url = f"{self.base_url}/repos/{repo_name}/git/blobs/{sha}"
+        try:
+            text = self._get_text(url, accept='application/vnd.github.raw')
+        except requests.exceptions.RequestException as e:
+            if getattr(e.response, 'status_code', None) == 404:
+                return {'content': None, 'encoding': None, 'size': 0, 'error': 'File not found'}
             return {'content': None, 'encoding': None, 'size': 0, 'error': str(e)}
+        
+        result = {'decoded_content': text, 'size': len(text), 'sha': sha}
+        self._content_cache.set(('blob', sha), result)
+        return dict(result)
     
-    def _decode_and_analyze_content(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _decode_and_analyze_content(self, content_data: Dict[str, Any], is_binary: bool = False) -> Dict[str, Any]:
         """
         Decode base64 content and perform basic analysis
         
         Args:
             content_data (Dict[str, Any]): File content data from GitHub API
+            is_binary (bool): Skip decoding; binary files have no meaningful text
             
         Returns:
             Dict[str, Any]: Enhanced content data with decoded content and analysis
@@ -400,25 +1016,35 @@ class GitHubPRCollector:
         if not content_data.get('content'):
             return content_data
         
+        if is_binary:
+            content_data['decoded_content'] = None
+            content_data['analysis'] = None
+            return content_data
+        
         try:
             # Decode base64 content
             encoded_content = content_data.get('content', '')
             if content_data.get('encoding') == 'base64':
-                decoded_content = base64.b64decode(encoded_content).decode('utf-8', errors='ignore')
+                # a2b_base64 skips the line breaks GitHub puts in the payload
+                decoded_content = binascii.a2b_base64(encoded_content).decode('utf-8', errors='ignore')
                 content_data['decoded_content'] = decoded_content
                 
-                # Basic content analysis
+                # Basic content analysis. One counting pass over the lines; none of the
+                # markers span a newline, so "in any line" is a substring test on the text
                 lines = decoded_content.split('\n')
+                non_empty_lines = sum(1 for _ in filter(None, map(str.strip, lines)))
                 content_data['analysis'] = {
                     'total_lines': len(lines),
-                    'non_empty_lines': len([line for line in lines if line.strip()]),
-                    'empty_lines': len([line for line in lines if not line.strip()]),
+                    'non_empty_lines': non_empty_lines,
+                    'empty_lines': len(lines) - non_empty_lines,
                     'total_characters': len(decoded_content),
-                    'total_words': len(re.findall(r'\b\w+\b', decoded_content)),
-                    'has_comments': any('//' in line or '#' in line or '/*' in line for line in lines),
-                    'has_functions': any('def ' in line or 'function ' in line or 'public ' in line for line in lines),
-                    'has_classes': any('class ' in line for line in lines),
-                    'has_imports': any('import ' in line or 'from ' in line or '#include' in line for line in lines)
+                    'total_words': len(_WORD_RE.findall(decoded_content)),
+                    'has_comments': '//' in decoded_content or '#' in decoded_content or '/*' in decoded_content,
+                    'has_functions': ('def ' in decoded_content or 'function ' in decoded_content
+                                      or 'public ' in decoded_content),
+                    'has_classes': 'class ' in decoded_content,
+                    'has_imports': ('import ' in decoded_content or 'from ' in decoded_content
+                                    or '#include' in decoded_content)
                 }
             else:
                 content_data['decoded_content'] = encoded_content
@@ -441,7 +1067,8 @@ class GitHubPRCollector:
         
         return content_data
     
-    def _get_merged_pr_file_contents(self, repo_name: str, pr_number: int, files_info: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _get_merged_pr_file_contents(self, repo_name: str, pr_number: int, files_info: List[Dict[str, Any]],
+                                     pr_details: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """
         Fetch pre/post file contents for merged PRs and generate summaries and risk assessments
         
@@ -449,12 +1076,14 @@ class GitHubPRCollector:
             repo_name (str): Repository name in format 'owner/repo'
             pr_number (int): Pull request number
             files_info (List[Dict[str, Any]]): List of file information
+            pr_details (Dict[str, Any], optional): Detailed PR information, fetched if not given
             
         Returns:
             List[Dict[str, Any]]: Enhanced file information with contents, summaries, and risk assessments
         """
         # Get PR details to find base and head branches
-        pr_details = self._get_detailed_pr_info(repo_name, pr_number)
+        if pr_details is None:
+            pr_details = self._get_detailed_pr_info(repo_name, pr_number)
         
         # Handle case where pr_details is None
         if pr_details is None:
@@ -464,12 +1093,12 @@ class GitHubPRCollector:
         head_branch = pr_details.get('head', {}).get('ref', 'main')
         
         enhanced_files = []
+        analysis_jobs = []
         
         for file_info in files_info:
             filename = file_info.get('filename')
             status = file_info.get('status')
-            language = file_info.get('language', 'Unknown')
-            diff = file_info.get('patch', '')
+            is_binary = file_info.get('is_binary', False)
             
             if not filename:
                 continue
@@ -481,81 +1110,91 @@ class GitHubPRCollector:
             file_info['ai_summary'] = None
             file_info['risk_assessment'] = None
             
+            # No content fetch or summary call for files whose summary would be noise
+            if _skip_file_contents(file_info):
+                analysis_jobs.append((file_info, '', ''))
+                enhanced_files.append(file_info)
+                continue
+            
+            pre_content = {}
+            post_content = {}
             try:
-                if status == 'added':
-                    # File was added - only get post content (head branch)
-                    post_content = self._get_file_contents(repo_name, filename, head_branch)
-                    if post_content.get('content'):
-                        post_content = self._decode_and_analyze_content(post_content)
-                    file_info['post_content'] = post_content.get('decoded_content')
-                    file_info['post_content_sha'] = post_content.get('sha')
-                    
-                    # Generate summary for added files
-                    if self.openai_client:
-                        file_info['ai_summary'] = self._generate_file_summary(
-                            filename, "", post_content.get('decoded_content', ''), diff, language
-                        )
-                    
-                elif status == 'removed':
-                    # File was removed - get pre content for summary, but don't save it
+                if status in ['removed', 'modified', 'renamed'] and self.openai_client:
+                    # Pre content (base branch) is only used for the summary, never saved
                     pre_content = self._get_file_contents(repo_name, filename, base_branch)
                     if pre_content.get('content'):
-                        pre_content = self._decode_and_analyze_content(pre_content)
-                    
-                    # Generate summary for removed files
-                    if self.openai_client:
-                        file_info['ai_summary'] = self._generate_file_summary(
-                            filename, pre_content.get('decoded_content', ''), "", diff, language
-                        )
-                    
-                elif status in ['modified', 'renamed']:
-                    # File was modified or renamed - get both pre and post content for summary
-                    pre_content = self._get_file_contents(repo_name, filename, base_branch)
-                    if pre_content.get('content'):
-                        pre_content = self._decode_and_analyze_content(pre_content)
-                    
-                    # For renamed files, check if the new filename exists
-                    post_filename = filename
-                    if status == 'renamed' and file_info.get('previous_filename'):
-                        post_filename = filename  # Current filename is the new one
-                    
-                    post_content = self._get_file_contents(repo_name, post_filename, head_branch)
-                    if post_content.get('content'):
-                        post_content = self._decode_and_analyze_content(post_content)
-                    
-                    # Only save post content
+                        pre_content = self._decode_and_analyze_content(pre_content, is_binary)
+                
+                if status in ['added', 'modified', 'renamed']:
+                    # For renamed files the current filename is the new one. Prefer the
+                    # head version's blob; the Contents API is the fallback
+                    if file_info.get('sha'):
+                        post_content = self._get_blob_contents(repo_name, file_info['sha'])
+                    else:
+                        post_content = self._get_file_contents(repo_name, filename, head_branch)
+                        if post_content.get('content'):
+                            post_content = self._decode_and_analyze_content(post_content, is_binary)
                     file_info['post_content'] = post_content.get('decoded_content')
                     file_info['post_content_sha'] = post_content.get('sha')
-                    
-                    # Generate summary for modified/renamed files
-                    if self.openai_client:
-                        file_info['ai_summary'] = self._generate_file_summary(
-                            filename, 
-                            pre_content.get('decoded_content', ''), 
-                            post_content.get('decoded_content', ''), 
-                            diff, 
-                            language
-                        )
                 
                 # Check for content errors
-                if pre_content and pre_content.get('error'):
+                if pre_content.get('error'):
                     file_info['content_error'] = f"Pre content error: {pre_content.get('error')}"
-                elif post_content and post_content.get('error'):
+                elif post_content.get('error'):
                     file_info['content_error'] = f"Post content error: {post_content.get('error')}"
                 
-                # Generate risk assessment for all files
-                if self.openai_client:
-                    file_info['risk_assessment'] = self._generate_file_risk_assessment(
-                        repo_name, pr_number, file_info
-                    )
+                analysis_jobs.append((
+                    file_info, pre_content.get('decoded_content', ''), post_content.get('decoded_content', '')
+                ))
                 
             except Exception as e:
                 file_info['content_error'] = f"Error fetching content: {str(e)}"
             
             enhanced_files.append(file_info)
         
+        # Summaries and risk assessments for all files of the PR run in parallel
+        if self.openai_client:
+            futures = [
+                self._llm_pool.submit(self._analyze_merged_file, repo_name, pr_number, file_info, pre, post)
+                for file_info, pre, post in analysis_jobs
+            ]
+            for future in futures:
+                future.result()
+        
         return enhanced_files
     
+    def _analyze_merged_file(self, repo_name: str, pr_number: int, file_info: Dict[str, Any],
+                             pre_content: str, post_content: str):
+        """
+        Fill in ai_summary and risk_assessment for one file of a merged PR
+        
+        Args:
+            repo_name (str): Repository name in format 'owner/repo'
+            pr_number (int): Pull request number
+            file_info (Dict[str, Any]): File information, updated in place
+            pre_content (str): Decoded content before the change ('' for added files)
+            post_content (str): Decoded content after the change ('' for removed files)
+        """
+        filename = file_info.get('filename')
+        status = file_info.get('status')
+        language = file_info.get('language', 'Unknown')
+        diff = file_info.get('patch', '')
+        is_binary = file_info.get('is_binary', False)
+        
+        if _skip_file_contents(file_info):
+            file_info['ai_summary'] = SKIPPED_SUMMARY
+        elif status == 'added':
+            file_info['ai_summary'] = self._generate_file_summary(filename, "", post_content, diff, language, is_binary)
+        elif status == 'removed':
+            file_info['ai_summary'] = self._generate_file_summary(filename, pre_content, "", diff, language, is_binary)
+        elif status in ['modified', 'renamed']:
+            file_info['ai_summary'] = self._generate_file_summary(
+                filename, pre_content, post_content, diff, language, is_binary
+            )
+        
+        # Generate risk assessment for all files
+        file_info['risk_assessment'] = self._generate_file_risk_assessment(repo_name, pr_number, file_info)
+    
     def _generate_pr_summary(self, pr_data: Dict[str, Any]) -> str:
         """
         Generate a PR-level summary using file summaries or PR metadata
@@ -573,7 +1212,7 @@ class GitHubPRCollector:
             # Check if PR is merged and has file summaries
             is_merged = pr_data.get('is_merged', False)
             files = pr_data.get('files', [])
-            file_summaries = [f.get('ai_summary') for f in files if f.get('ai_summary') and f.get('ai_summary') != "Summary not available (OpenAI API key not configured)"]
+            file_summaries = [f.get('ai_summary') for f in files if f.get('ai_summary') and f.get('ai_summary') not in ("Summary not available (OpenAI API key not configured)", SKIPPED_SUMMARY)]
             
             if is_merged and file_summaries:
                 # Use file summaries for merged PRs
@@ -623,30 +1262,12 @@ class GitHubPRCollector:
             
             # Call OpenAI API
             try:
-                # Try newer OpenAI client first
-                if hasattr(self.openai_client, 'chat'):
-                    response = self.openai_client.chat.completions.create(
-                        model="gpt-4o-mini",
-                        messages=[
-                            {"role": "system", "content": "You are a helpful assistant that analyzes pull requests and provides comprehensive summaries."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        max_tokens=300,
-                        temperature=0.3
-                    )
-                    summary = response.choices[0].message.content.strip()
-                else:
-                    # Fallback to older openai library
-                    response = self.openai_client.ChatCompletion.create(
-                        model="gpt-4o-mini",
-                        messages=[
-                            {"role": "system", "content": "You are a helpful assistant that analyzes pull requests and provides comprehensive summaries."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        max_tokens=300,
-                        temperature=0.3
-                    )
-                    summary = response.choices[0].message.content.strip()
+                summary = self._chat_completion(
+                    "You are a helpful assistant that analyzes pull requests and provides comprehensive summaries.",
+                    prompt,
+                    max_tokens=300,
+                    temperature=0.3
+                )
             except Exception as api_error:
                 print(f"OpenAI API error for PR #{pr_data.get('pr_number')}: {api_error}")
                 return f"Error calling OpenAI API: {str(api_error)}"
@@ -656,77 +1277,6 @@ class GitHubPRCollector:
         except Exception as e:
             return f"Error generating PR summary: {str(e)}"
     
-    def _detect_language(self, filename: str) -> str:
-        """Detect programming language based on file extension"""
-        extension = self._get_file_extension(filename).lower()
-        language_map = {
-            '.py': 'Python', '.js': 'JavaScript', '.ts': 'TypeScript', '.java': 'Java',
-            '.cpp': 'C++', '.c': 'C', '.cs': 'C#', '.php': 'PHP', '.rb': 'Ruby',
-            '.go': 'Go', '.rs': 'Rust', '.swift': 'Swift', '.kt': 'Kotlin',
-            '.scala': 'Scala', '.clj': 'Clojure', '.hs': 'Haskell', '.ml': 'OCaml',
-            '.html': 'HTML', '.css': 'CSS', '.scss': 'SCSS', '.sass': 'Sass',
-            '.sql': 'SQL', '.r': 'R', '.m': 'MATLAB', '.sh': 'Shell',
-            '.yaml': 'YAML', '.yml': 'YAML', '.json': 'JSON', '.xml': 'XML',
-            '.md': 'Markdown', '.txt': 'Text', '.rst': 'reStructuredText',
-            '.dockerfile': 'Dockerfile', '.dockerignore': 'Docker',
-            '.gitignore': 'Git', '.gitattributes': 'Git'
-        }
-        return language_map.get(extension, 'Unknown')
-    
-    def _get_file_extension(self, filename: str) -> str:
-        """Get file extension from filename"""
-        if '.' in filename:
-            return '.' + filename.split('.')[-1]
-        return ''
-    
-    def _is_binary_file(self, filename: str) -> bool:
-        """Check if file is likely binary"""
-        binary_extensions = {'.exe', '.dll', '.so', '.dylib', '.bin', '.dat', '.zip', 
-                           '.tar', '.gz', '.rar', '.7z', '.png', '.jpg', '.jpeg', 
-                           '.gif', '.bmp', '.ico', '.pdf', '.doc', '.docx', '.xls', 
-                           '.xlsx', '.ppt', '.pptx', '.mp3', '.mp4', '.avi', '.mov'}
-        return self._get_file_extension(filename).lower() in binary_extensions
-    
-    def _is_config_file(self, filename: str) -> bool:
-        """Check if file is a configuration file"""
-        config_patterns = ['config', 'conf', 'ini', 'cfg', 'properties', 'env', 
-                          'dockerfile', 'docker-compose', 'package.json', 'requirements.txt',
-                          'pom.xml', 'build.gradle', 'cargo.toml', 'go.mod', 'composer.json']
-        filename_lower = filename.lower()
-        return any(pattern in filename_lower for pattern in config_patterns)
-    
-    def _is_documentation_file(self, filename: str) -> bool:
-        """Check if file is documentation"""
-        doc_extensions = {'.md', '.rst', '.txt', '.pdf', '.doc', '.docx'}
-        doc_patterns = ['readme', 'license', 'changelog', 'contributing', 'docs/', 'documentation/']
-        filename_lower = filename.lower()
-        return (self._get_file_extension(filename).lower() in doc_extensions or
-                any(pattern in filename_lower for pattern in doc_patterns))
-    
-    def _is_test_file(self, filename: str) -> bool:
-        """Check if file is a test file"""
-        test_patterns = ['test', 'spec', 'specs', 'test_', '_test', 'tests/', 'specs/']
-        filename_lower = filename.lower()
-        return any(pattern in filename_lower for pattern in test_patterns)
-    
-    def _is_source_code_file(self, filename: str) -> bool:
-        """Check if file is source code"""
-        source_extensions = {'.py', '.js', '.ts', '.java', '.cpp', '.c', '.cs', '.php', 
-                           '.rb', '.go', '.rs', '.swift', '.kt', '.scala', '.clj', 
-                           '.hs', '.ml', '.html', '.css', '.scss', '.sql', '.r', '.sh'}
-        return (self._get_file_extension(filename).lower() in source_extensions and
-                not self._is_test_file(filename) and not self._is_config_file(filename))
-    
-    def _get_change_type(self, status: str) -> str:
-        """Get human-readable change type"""
-        change_types = {
-            'added': 'Added',
-            'modified': 'Modified', 
-            'removed': 'Removed',
-            'renamed': 'Renamed'
-        }
-        return change_types.get(status, status.capitalize())
-    
     def _calculate_file_statistics(self, files_info: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Calculate comprehensive statistics from file information
@@ -902,7 +1452,8 @@ class GitHubPRCollector:
         
         if (file_info.get('is_binary', False) or 
             file_size > 1000000 or  # Skip files larger than 1MB
-            file_extension in ['exe', 'dll', 'so', 'dylib', 'bin', 'dat', 'db', 'sqlite']):
+            file_extension in ['exe', 'dll', 'so', 'dylib', 'bin', 'dat', 'db', 'sqlite'] or
+            file_path.endswith(GENERATED_FILE_SUFFIXES)):
             return {
                 "file_path": file_path,
                 "risk_score_file": 0,
@@ -1000,30 +1551,12 @@ DIFF (unified):
             
             # Call OpenAI API
             try:
-                # Try newer OpenAI client first
-                if hasattr(self.openai_client, 'chat'):
-                    response = self.openai_client.chat.completions.create(
-                        model="gpt-4o-mini",
-                        messages=[
-                            {"role": "system", "content": "You are a meticulous code risk assessor. Return only valid JSON."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        max_tokens=500,
-                        temperature=0.1
-                    )
-                    risk_assessment_text = response.choices[0].message.content.strip()
-                else:
-                    # Fallback to older openai library
-                    response = self.openai_client.ChatCompletion.create(
-                        model="gpt-4o-mini",
-                        messages=[
-                            {"role": "system", "content": "You are a meticulous code risk assessor. Return only valid JSON."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        max_tokens=500,
-                        temperature=0.1
-                    )
-                    risk_assessment_text = response.choices[0].message.content.strip()
+                risk_assessment_text = self._chat_completion(
+                    "You are a meticulous code risk assessor. Return only valid JSON.",
+                    prompt,
+                    max_tokens=500,
+                    temperature=0.1
+                )
                 
                 # Parse JSON response with enhanced error handling
                 try:
@@ -1050,8 +1583,7 @@ DIFF (unified):
                     print(f"Raw response: {risk_assessment_text[:200]}...")
                     
                     # Try to extract JSON from the response using regex
-                    import re
-                    json_match = re.search(r'\{.*\}', risk_assessment_text, re.DOTALL)
+                    json_match = _JSON_OBJECT_RE.search(risk_assessment_text)
                     if json_match:
                         try:
                             extracted_json = json_match.group(0)
@@ -1317,18 +1849,20 @@ DIFF (unified):
         
         # Check if all files are documentation files
         for file_info in files_info:
-            if not self._is_documentation_file(file_info.get('filename', '')):
+            if not file_info.get('is_documentation', False):
                 return False
         
         return True
     
-    def _extract_pr_metadata(self, pr: Dict[str, Any], repo_name: str) -> Dict[str, Any]:
+    def _extract_pr_metadata(self, pr: Dict[str, Any], repo_name: str,
+                             detailed_pr: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Extract required metadata from a pull request
         
         Args:
             pr (Dict[str, Any]): Raw PR data from GitHub API
             repo_name (str): Repository name for fetching detailed PR info
+            detailed_pr (Dict[str, Any], optional): Detailed PR information, fetched if not given
             
         Returns:
             Dict[str, Any]: Extracted metadata
@@ -1358,7 +1892,8 @@ DIFF (unified):
             print(f"Warning: PR number is None for PR data: {pr}")
             return {}
         
-        detailed_pr = self._get_detailed_pr_info(repo_name, pr_number)
+        if detailed_pr is None:
+            detailed_pr = self._get_detailed_pr_info(repo_name, pr_number)
         
         # Handle case where detailed_pr is None
         if detailed_pr is None:
@@ -1381,7 +1916,7 @@ DIFF (unified):
         # Fetch pre/post file contents for merged PRs
         if detailed_pr.get('merged_at'):
             try:
-                enhanced_files_info = self._get_merged_pr_file_contents(repo_name, pr_number, files_info)
+                enhanced_files_info = self._get_merged_pr_file_contents(repo_name, pr_number, files_info, detailed_pr)
             except Exception as e:
                 print(f"Error in _get_merged_pr_file_contents for PR #{pr_number}: {e}")
                 enhanced_files_info = files_info
@@ -1612,6 +2147,8 @@ def main():
     parser.add_argument('--state', choices=['open', 'closed', 'all'], default='all',
                        help='Filter PRs by state (default: all)')
     parser.add_argument('--output', help='Output filename (optional)')
+    parser.add_argument('--no-resume', action='store_true',
+                       help='Reprocess every PR instead of reusing checkpointed ones')
     
     args = parser.parse_args()
     
@@ -1626,8 +2163,10 @@ def main():
         # Initialize collector
         collector = GitHubPRCollector(github_token)
         
-        # Fetch PR data
-        pr_data = collector.get_repo_pull_requests(args.repo, args.state)
+        # Fetch PR data; each PR is checkpointed as it completes
+        pr_data = []
+        for pr in collector.iter_repo_pull_requests(args.repo, args.state, resume=not args.no_resume):
+            pr_data.append(pr)
         
         if not pr_data:
             print("No pull requests found for the specified repository and state.")
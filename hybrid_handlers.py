@@ -4,12 +4,13 @@ Hybrid handlers for combining scalar filters with vector search.
 Handles topic-based queries with semantic terms.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any
 from milvus_client import search_prs, search_files, query_files, query_prs
+import numpy as np
 import openai
 import os
 
-def get_embedding(text: str) -> List[float]:
+def get_embedding(text: str) -> np.ndarray:
     """
     Get embedding for text using OpenAI.
     
@@ -17,7 +18,7 @@ def get_embedding(text: str) -> List[float]:
         text: Text to embed
         
     Returns:
-        Embedding vector
+        Embedding vector as a contiguous float32 array
     """
     try:
         openai_client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
@@ -25,11 +26,11 @@ def get_embedding(text: str) -> List[float]:
             model="text-embedding-3-small",
             input=text
         )
-        return response.data[0].embedding
+        return np.ascontiguousarray(response.data[0].embedding, dtype=np.float32)
     except Exception as e:
         print(f"Error getting embedding: {e}")
         # Return zero vector as fallback
-        return [0.0] * 1536
+        return np.zeros(1536, dtype=np.float32)
 
 def hybrid_features(repo: str, start: int, end: int, terms: str, k: int = 50) -> List[Dict[str, Any]]:
     """
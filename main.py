@@ -7,6 +7,7 @@ import os
 import json
 from datetime import datetime, timedelta, date
 from typing import List, Dict, Any, Optional
+import numpy as np
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse, JSONResponse
@@ -22,8 +23,8 @@ from supabase import create_client, Client
 from time_parse import parse_time
 from router import route_query
 from direct_handlers import (
-    direct_prs_list, direct_features_list, direct_top_file_by_lines,
-    direct_pr_count, direct_top_prs_by_risk, direct_file_changes_summary
+    direct_prs_list_async, direct_features_list_async, direct_top_file_by_lines_async,
+    direct_pr_count_async
 )
 from hybrid_handlers import (
     hybrid_features, hybrid_risky_files, hybrid_auth_features,
@@ -1024,8 +1025,8 @@ def initialize_connections():
         print(f"Failed to initialize OpenAI client: {e}")
         raise
 
-def get_embedding(text: str) -> List[float]:
-    """Generate embedding for text using OpenAI"""
+def get_embedding(text: str) -> np.ndarray:
+    """Generate embedding for text using OpenAI, as a contiguous float32 array"""
     if not openai_client:
         raise ValueError("OpenAI client not initialized")
     
@@ -1034,7 +1035,7 @@ def get_embedding(text: str) -> List[float]:
             model="text-embedding-ada-002",
             input=text
         )
-        return response.data[0].embedding
+        return np.ascontiguousarray(response.data[0].embedding, dtype=np.float32)
     except Exception as e:
         print(f"Error generating embedding: {e}")
         raise
@@ -2821,7 +2822,7 @@ async def search_prs(request: SearchRequest):
             search_results = []
             
             if plan["object"] == "features":
-                data = direct_features_list(request.repo_name, start, end, None, request.limit)
+                data = await direct_features_list_async(request.repo_name, start, end, None, request.limit)
                 search_results = []
                 for item in data:
                     search_results.append(SearchResult(
@@ -2851,7 +2852,7 @@ async def search_prs(request: SearchRequest):
                     ))
                 
             elif plan["object"] == "files" and plan["metric"] == "top":
-                data = direct_top_file_by_lines(request.repo_name, start, end)
+                data = await direct_top_file_by_lines_async(request.repo_name, start, end)
                 if data:
                     search_results = [SearchResult(
                         pr_id=0,
@@ -2886,7 +2887,7 @@ async def search_prs(request: SearchRequest):
                 author = plan.get("author")
                 pr_number = plan.get("pr_number")
                 limit = plan.get("limit", request.limit)  # Use plan limit if available, otherwise request limit
-                data, summary = direct_prs_list(request.repo_name, start, end, author, pr_number, limit, sort_by_largest=True)
+                data, summary = await direct_prs_list_async(request.repo_name, start, end, author, pr_number, limit, sort_by_largest=True)
                 search_results = []
                 for item in data:
                     search_results.append(SearchResult(
@@ -2920,7 +2921,7 @@ async def search_prs(request: SearchRequest):
                 author = plan.get("author")
                 pr_number = plan.get("pr_number")
                 limit = plan.get("limit", request.limit)  # Use plan limit if available, otherwise request limit
-                data, summary = direct_prs_list(request.repo_name, start, end, author, pr_number, limit, sort_by_riskiest=True)
+                data, summary = await direct_prs_list_async(request.repo_name, start, end, author, pr_number, limit, sort_by_riskiest=True)
                 search_results = []
                 for item in data:
                     search_results.append(SearchResult(
@@ -2950,7 +2951,7 @@ async def search_prs(request: SearchRequest):
                     ))
                     
             elif plan["metric"] == "count":
-                data = direct_pr_count(request.repo_name, start, end)
+                data = await direct_pr_count_async(request.repo_name, start, end)
                 search_results = [SearchResult(
                     pr_id=0,
                     pr_number=0,
@@ -2981,7 +2982,7 @@ async def search_prs(request: SearchRequest):
                 # Get author and PR number from plan if available
                 author = plan.get("author")
                 pr_number = plan.get("pr_number")
-                data, summary = direct_prs_list(request.repo_name, start, end, author, pr_number, request.limit)
+                data, summary = await direct_prs_list_async(request.repo_name, start, end, author, pr_number, request.limit)
                 search_results = []
                 for item in data:
                     search_results.append(SearchResult(
@@ -4196,16 +4197,11 @@ async def get_what_shipped_summary(
         
         top_authors = sorted(author_counts.items(), key=lambda x: x[1], reverse=True)[:5]
         
-        # Risk distribution
-        risk_distribution = {"low": 0, "medium": 0, "high": 0}
-        for pr in data:
-            risk_score = pr.get('risk_score', 0)
-            if risk_score >= 7.0:
-                risk_distribution["high"] += 1
-            elif risk_score >= 4.0:
-                risk_distribution["medium"] += 1
-            else:
-                risk_distribution["low"] += 1
+        # Risk distribution: bucket every score in one vectorized pass
+        # (digitize: < 4.0 -> 0 low, 4.0-7.0 -> 1 medium, >= 7.0 -> 2 high)
+        risk_scores = np.fromiter((float(pr.get('risk_score') or 0) for pr in data), dtype=np.float64, count=len(data))
+        low, medium, high_band = np.bincount(np.digitize(risk_scores, [4.0, 7.0]), minlength=3).tolist()
+        risk_distribution = {"low": low, "medium": medium, "high": high_band}
         
         # Feature distribution
         feature_distribution = {"features": features, "non_features": total_prs - features}
@@ -2,13 +2,79 @@
 """
 Milvus client module for querying PRs and files.
 Provides utility functions for both scalar queries and vector search.
+
+The direct handlers filter every query on merged_at ranges plus exact repo_name /
+author_name / pr_id / pr_number matches. Without the scalar indexes that
+milvus_data_load/load_to_milvus.py creates (PR_SCALAR_INDEXES, FILE_SCALAR_INDEXES),
+each of those filters is a full segment scan.
 """
 
+import logging
 import os
-from typing import List, Dict, Any, Optional
-from pymilvus import connections, Collection, utility
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional
+from pymilvus import connections, Collection
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+# The connection is shared across requests; the server is pinged at most this often
+# to detect a dropped connection before reusing it
+MILVUS_LIVENESS_INTERVAL = 30  # seconds
+
+# Dashboards fire overlapping scalar queries for the same window within seconds.
+# Results are reused for a short TTL, and identical queries already in flight
+# share one round trip. Counts change only when data is bulk-loaded, so they live longer.
+QUERY_CACHE_TTL = 30  # seconds
+COUNT_CACHE_TTL = 600  # seconds
+QUERY_CACHE_SIZE = 512
+
+# Page size for unbounded scalar queries (limit=None / *_iter)
+QUERY_BATCH_SIZE = 1024
+_query_cache = OrderedDict()  # key -> (expires_at, Future)
+_query_cache_lock = threading.Lock()
+
+# Independent queries are issued concurrently over the shared connection;
+# pymilvus calls block on gRPC, so they fan out on a small thread pool
+_query_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="milvus-query")
+
+def run_concurrently(calls) -> List[Any]:
+    """Run (fn, *args) tuples on the Milvus query pool and return their results in order"""
+    futures = [_query_executor.submit(*call) for call in calls]
+    return [future.result() for future in futures]
+
+def _cached_call(key, ttl: float, fn):
+    """Return fn(), shared with identical calls made within ttl seconds or still in flight"""
+    now = time.monotonic()
+    with _query_cache_lock:
+        entry = _query_cache.get(key)
+        owner = entry is None or entry[0] <= now
+        if owner:
+            entry = (now + ttl, Future())
+            _query_cache[key] = entry
+            while len(_query_cache) > QUERY_CACHE_SIZE:
+                _query_cache.popitem(last=False)
+        _query_cache.move_to_end(key)
+    
+    future = entry[1]
+    if owner:
+        try:
+            future.set_result(fn())
+        except Exception as e:
+            # Failures are reported to everyone waiting but never cached
+            with _query_cache_lock:
+                if _query_cache.get(key) is entry:
+                    del _query_cache[key]
+            future.set_exception(e)
+    return future.result()
+
+def quote_string(value: str) -> str:
+    """Quote a value as a Milvus expression string literal, escaping backslashes and quotes"""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
 class MilvusClient:
     """Client for interacting with Milvus vector database"""
     
@@ -17,6 +83,8 @@ class MilvusClient:
         self.pr_collection = None
         self.file_collection = None
         self.embedding_dim = 1536
+        self._checked_at = 0.0
+        self._pr_field_names = None
         
     def connect(self):
         """Initialize connection to Milvus"""
@@ -40,6 +108,7 @@ class MilvusClient:
             # Get collections
             self.pr_collection = Collection("pr_index_what_the_repo")
             self.file_collection = Collection("file_changes_what_the_repo")
+            self._checked_at = time.monotonic()
             
             print("✅ Milvus connection established")
             
@@ -47,13 +116,39 @@ class MilvusClient:
             print(f"❌ Failed to connect to Milvus: {e}")
             raise
     
-    def query_prs(self, expr: str, fields: List[str]) -> List[Dict[str, Any]]:
+    @property
+    def pr_field_names(self) -> frozenset:
+        """Field names of the PR collection schema, read once per connection"""
+        if self._pr_field_names is None:
+            self._pr_field_names = frozenset(field.name for field in self.pr_collection.schema.fields)
+        return self._pr_field_names
+    
+    def is_alive(self) -> bool:
+        """Check the connection is usable; only hits the server every MILVUS_LIVENESS_INTERVAL"""
+        if not self.pr_collection:
+            return False
+        
+        now = time.monotonic()
+        if now - self._checked_at < MILVUS_LIVENESS_INTERVAL:
+            return True
+        
+        try:
+            self.pr_collection.describe()
+        except Exception as e:
+            print(f"⚠️ Milvus connection check failed: {e}")
+            return False
+        
+        self._checked_at = now
+        return True
+    
+    def query_prs(self, expr: str, fields: List[str], limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
         """
         Query PRs using scalar filters.
         
         Args:
             expr: Scalar expression for filtering
             fields: List of fields to return
+            limit: Maximum number of records to return; None pages through every match
             
         Returns:
             List of PR records
@@ -62,30 +157,36 @@ class MilvusClient:
             raise ValueError("PR collection not initialized")
         
         try:
-            print(f"🔍 Milvus PR Query:")
-            print(f"   Expression: {expr}")
-            print(f"   Fields: {fields}")
-            
-            results = self.pr_collection.query(
-                expr=expr,
-                output_fields=fields,
-                limit=1000  # Adjust as needed
+            results = _cached_call(
+                ("prs", expr, tuple(fields), limit), QUERY_CACHE_TTL,
+                lambda: self._query_rows(self.pr_collection, expr, fields, limit)
             )
-            
-            print(f"   Raw results count: {len(results)}")
-            if results:
-                print(f"   Sample raw result: {results[0]}")
-            
-            # Convert numpy types to Python native types
-            converted_results = [self._convert_numpy_types(record) for record in results]
-            print(f"   Converted results count: {len(converted_results)}")
-            
-            return converted_results
+            # Callers sort the list in place; give each its own copy
+            return list(results)
             
         except Exception as e:
             print(f"Error querying PRs: {e}")
             return []
     
+    def count_prs(self, expr: str) -> int:
+        """
+        Count PRs matching a scalar filter server-side, without fetching rows.
+        
+        Args:
+            expr: Scalar expression for filtering
+            
+        Returns:
+            Number of matching PR records
+        """
+        if not self.pr_collection:
+            raise ValueError("PR collection not initialized")
+        
+        try:
+            return _cached_call(("count_prs", expr), COUNT_CACHE_TTL, lambda: self._count_rows(self.pr_collection, expr))
+        except Exception as e:
+            print(f"Error counting PRs: {e}")
+            return 0
+    
     def search_prs(self, vec: List[float], expr: str, fields: List[str], k: int = 50) -> List[Dict[str, Any]]:
         """
         Search PRs using vector similarity with scalar pre-filtering.
@@ -118,7 +219,7 @@ class MilvusClient:
             print(f"   Search params: {search_params}")
             
             results = self.pr_collection.search(
-                data=[vec],
+                data=np.asarray(vec, dtype=np.float32).reshape(1, -1),  # one float32 row, no list boxing
                 anns_field="vector",
                 param=search_params,
                 expr=expr,
@@ -162,30 +263,70 @@ class MilvusClient:
             raise ValueError("File collection not initialized")
         
         try:
-            print(f"🔍 Milvus File Query:")
-            print(f"   Expression: {expr}")
-            print(f"   Fields: {fields}")
-            
-            results = self.file_collection.query(
-                expr=expr,
-                output_fields=fields,
-                limit=1000  # Adjust as needed
+            results = _cached_call(
+                ("files", expr, tuple(fields), 1000), QUERY_CACHE_TTL,
+                lambda: self._query_rows(self.file_collection, expr, fields, 1000)
             )
-            
-            print(f"   Raw results count: {len(results)}")
-            if results:
-                print(f"   Sample raw result: {results[0]}")
-            
-            # Convert numpy types to Python native types
-            converted_results = [self._convert_numpy_types(record) for record in results]
-            print(f"   Converted results count: {len(converted_results)}")
-            
-            return converted_results
+            # Callers sort the list in place; give each its own copy
+            return list(results)
             
         except Exception as e:
             print(f"Error querying files: {e}")
             return []
     
+    def count_files(self, expr: str) -> int:
+        """
+        Count files matching a scalar filter server-side, without fetching rows.
+        
+        Args:
+            expr: Scalar expression for filtering
+            
+        Returns:
+            Number of matching file records
+        """
+        if not self.file_collection:
+            raise ValueError("File collection not initialized")
+        
+        try:
+            return _cached_call(("count_files", expr), COUNT_CACHE_TTL, lambda: self._count_rows(self.file_collection, expr))
+        except Exception as e:
+            print(f"Error counting files: {e}")
+            return 0
+    
+    def query_files_iter(self, expr: str, fields: List[str], batch_size: int = 1024) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream files matching a scalar filter in batches, without a row limit.
+        
+        Args:
+            expr: Scalar expression for filtering
+            fields: List of fields to return
+            batch_size: Number of records fetched per round trip
+            
+        Yields:
+            Lists of file records
+        """
+        if not self.file_collection:
+            raise ValueError("File collection not initialized")
+        
+        return self._iter_rows(self.file_collection, expr, fields, batch_size)
+    
+    def query_prs_iter(self, expr: str, fields: List[str], batch_size: int = 1024) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream PRs matching a scalar filter in batches, without a row limit.
+        
+        Args:
+            expr: Scalar expression for filtering
+            fields: List of fields to return
+            batch_size: Number of records fetched per round trip
+            
+        Yields:
+            Lists of PR records
+        """
+        if not self.pr_collection:
+            raise ValueError("PR collection not initialized")
+        
+        return self._iter_rows(self.pr_collection, expr, fields, batch_size)
+    
     def search_files(self, vec: List[float], expr: str, fields: List[str], k: int = 50) -> List[Dict[str, Any]]:
         """
         Search files using vector similarity with scalar pre-filtering.
@@ -218,7 +359,7 @@ class MilvusClient:
             print(f"   Search params: {search_params}")
             
             results = self.file_collection.search(
-                data=[vec],
+                data=np.asarray(vec, dtype=np.float32).reshape(1, -1),  # one float32 row, no list boxing
                 anns_field="vector",
                 param=search_params,
                 expr=expr,
@@ -247,6 +388,38 @@ class MilvusClient:
             print(f"Error searching files: {e}")
             return []
     
+    def _iter_rows(self, collection, expr: str, fields: List[str], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Page through a scalar query with query_iterator, converting each batch"""
+        iterator = collection.query_iterator(
+            batch_size=batch_size,
+            expr=expr,
+            output_fields=fields
+        )
+        try:
+            while True:
+                batch = iterator.next()
+                if not batch:
+                    break
+                yield [self._convert_numpy_types(record) for record in batch]
+        finally:
+            iterator.close()
+    
+    def _query_rows(self, collection, expr: str, fields: List[str], limit: Optional[int]) -> List[Dict[str, Any]]:
+        """Run a scalar query and convert the records to Python native types"""
+        if limit is None:
+            results = [record for batch in self._iter_rows(collection, expr, fields, QUERY_BATCH_SIZE) for record in batch]
+            logger.debug("Milvus query (paged): expr=%s fields=%s rows=%d", expr, fields, len(results))
+            return results
+        
+        results = collection.query(expr=expr, output_fields=fields, limit=limit)
+        logger.debug("Milvus query: expr=%s fields=%s rows=%d", expr, fields, len(results))
+        return [self._convert_numpy_types(record) for record in results]
+    
+    def _count_rows(self, collection, expr: str) -> int:
+        """Run a server-side count(*) query"""
+        results = collection.query(expr=expr, output_fields=["count(*)"])
+        return int(results[0]["count(*)"]) if results else 0
+    
     def _convert_numpy_types(self, obj: Any) -> Any:
         """Convert numpy types to Python native types"""
         if isinstance(obj, dict):
@@ -266,21 +439,48 @@ class MilvusClient:
             connections.disconnect(self.connection)
             print("✅ Milvus connection closed")
 
-# Global Milvus client instance
+# Global Milvus client instance, shared by every handler
 milvus_client = None
+_milvus_client_lock = threading.Lock()
 
 def get_milvus_client() -> MilvusClient:
-    """Get or create global Milvus client instance"""
+    """Get the global Milvus client, connecting on first use and reconnecting if it dropped"""
     global milvus_client
-    if milvus_client is None:
-        milvus_client = MilvusClient()
-        milvus_client.connect()
-    return milvus_client
+    client = milvus_client
+    if client is not None and client.is_alive():
+        return client
+    
+    # Handlers query from worker threads; only one of them (re)connects
+    with _milvus_client_lock:
+        if milvus_client is not None and milvus_client.is_alive():
+            return milvus_client
+        
+        if milvus_client is not None:
+            try:
+                milvus_client.close()
+            except Exception as e:
+                print(f"⚠️ Error closing stale Milvus connection: {e}")
+        
+        # Only publish the client once connect() succeeded, so a failed attempt is retried
+        client = MilvusClient()
+        client.connect()
+        milvus_client = client
+    return client
 
-def query_prs(expr: str, fields: List[str]) -> List[Dict[str, Any]]:
+def query_prs(expr: str, fields: List[str], limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
     """Utility function to query PRs"""
     client = get_milvus_client()
-    return client.query_prs(expr, fields)
+    return client.query_prs(expr, fields, limit)
+
+def query_prs_iter(expr: str, fields: List[str], batch_size: int = 1024) -> Iterator[List[Dict[str, Any]]]:
+    """Utility function to stream PRs in batches"""
+    client = get_milvus_client()
+    return client.query_prs_iter(expr, fields, batch_size)
+
+def count_prs(expr: str) -> int:
+    """Utility function to count PRs"""
+    client = get_milvus_client()
+    return client.count_prs(expr)
 
 def search_prs(vec: List[float], expr: str, fields: List[str], k: int = 50) -> List[Dict[str, Any]]:
     """Utility function to search PRs"""
@@ -292,6 +492,16 @@ def query_files(expr: str, fields: List[str]) -> List[Dict[str, Any]]:
     client = get_milvus_client()
     return client.query_files(expr, fields)
 
+def count_files(expr: str) -> int:
+    """Utility function to count files"""
+    client = get_milvus_client()
+    return client.count_files(expr)
+
+def query_files_iter(expr: str, fields: List[str], batch_size: int = 1024) -> Iterator[List[Dict[str, Any]]]:
+    """Utility function to stream files in batches"""
+    client = get_milvus_client()
+    return client.query_files_iter(expr, fields, batch_size)
+
 def search_files(vec: List[float], expr: str, fields: List[str], k: int = 50) -> List[Dict[str, Any]]:
     """Utility function to search files"""
     client = get_milvus_client()
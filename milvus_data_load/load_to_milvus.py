@@ -10,13 +10,30 @@ import json
 import argparse
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-import re
 import time
 import numpy as np
 from pymilvus import connections, Collection, FieldSchema, CollectionSchema, DataType, utility
 import openai
 from openai import OpenAI
 
+# Scalar indexes for the fields the API filters on (time window, repo, author, PR lookups).
+# Milvus 2.3 offers STL_SORT for numeric fields and Trie for VARCHAR; BOOL fields can't be
+# indexed until INVERTED arrives in 2.4. `feature` is only tested against "" and holds long
+# text, so a Trie on it would cost memory without helping.
+PR_SCALAR_INDEXES = {
+    "merged_at": "STL_SORT",
+    "pr_id": "STL_SORT",
+    "pr_number": "STL_SORT",
+    "total_changes": "STL_SORT",
+    "repo_name": "Trie",
+    "author_name": "Trie",
+}
+FILE_SCALAR_INDEXES = {
+    "merged_at": "STL_SORT",
+    "pr_number": "STL_SORT",
+    "repo_name": "Trie",
+}
+
 class MilvusPRLoader:
     def __init__(self, milvus_url: str = None, milvus_token: str = None):
         """
@@ -97,6 +114,8 @@ class MilvusPRLoader:
             FieldSchema(name="status", dtype=DataType.VARCHAR, max_length=64),
             FieldSchema(name="deletions", dtype=DataType.INT32),
             FieldSchema(name="changed_files", dtype=DataType.INT32),
+            # additions + deletions + changed_files, precomputed for "largest PRs" ranking
+            FieldSchema(name="total_changes", dtype=DataType.INT64),
             FieldSchema(name="feature", dtype=DataType.VARCHAR, max_length=2048),
             FieldSchema(name="pr_summary", dtype=DataType.VARCHAR, max_length=8192),
             FieldSchema(name="risk_score", dtype=DataType.FLOAT),
@@ -166,6 +185,31 @@ class MilvusPRLoader:
         
         print(f"[PASS] Created file collection '{self.file_collection_name}' with index")
     
+    def _create_scalar_indexes(self, collection: Collection, index_types: Dict[str, str]):
+        """
+        Create any missing scalar indexes on a collection; existing collections are upgraded too
+        
+        Args:
+            collection (Collection): Milvus collection
+            index_types (Dict[str, str]): Field name -> scalar index type
+        """
+        field_names = {field.name for field in collection.schema.fields}
+        for field_name, index_type in index_types.items():
+            index_name = f"{field_name}_idx"
+            # Collections created before a field was added to the schema won't have it
+            if field_name not in field_names or collection.has_index(index_name=index_name):
+                continue
+            try:
+                collection.create_index(
+                    field_name=field_name,
+                    index_params={"index_type": index_type},
+                    index_name=index_name
+                )
+                print(f"[PASS] Created {index_type} index on '{collection.name}.{field_name}'")
+            except Exception as e:
+                # Scalar indexes only speed up filtering; loading can proceed without them
+                print(f"[WARN] Could not create {index_type} index on '{collection.name}.{field_name}': {e}")
+    
     def _validate_and_format_vector(self, vector: List[float]) -> List[float]:
         """
         Validate and format vector to ensure it's float32 with correct dimension
@@ -339,6 +383,7 @@ class MilvusPRLoader:
             'status': status,
             'deletions': deletions,
             'changed_files': changed_files,
+            'total_changes': (additions or 0) + (deletions or 0) + (changed_files or 0),
             'feature': feature,
             'pr_summary': pr_summary,
             'risk_score': risk_score,
@@ -470,9 +515,17 @@ class MilvusPRLoader:
         # Get collections
         pr_collection = Collection(self.pr_collection_name)
         file_collection = Collection(self.file_collection_name)
+        self._create_scalar_indexes(pr_collection, PR_SCALAR_INDEXES)
+        self._create_scalar_indexes(file_collection, FILE_SCALAR_INDEXES)
         pr_collection.load()
         file_collection.load()
         
+        # Collections created before total_changes was added to the schema reject rows
+        # carrying it, so leave it out for them (recreate the collection to gain the field)
+        has_total_changes = 'total_changes' in {field.name for field in pr_collection.schema.fields}
+        if not has_total_changes:
+            print(f"[WARN] '{self.pr_collection_name}' has no total_changes field; recreate it to rank by size server-side")
+        
         total_pr_rows = 0
         total_file_rows = 0
         pr_batch_data = []
@@ -484,6 +537,8 @@ class MilvusPRLoader:
             try:
                 # Prepare PR data
                 pr_record = self._prepare_pr_data(pr)
+                if not has_total_changes:
+                    del pr_record['total_changes']
                 pr_batch_data.append(pr_record)
                 total_pr_rows += 1
                 
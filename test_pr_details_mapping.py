@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test mapping GraphQL PR details onto the REST fields the collector reads (no GitHub access needed)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'git_data_download'))
+
+from github_pr_collector import GitHubPRCollector
+
+def _shape(node):
+    return GitHubPRCollector._rest_shaped_pr_details(node)
+
+def test_merged_pr_mapping():
+    node = {
+        'number': 12, 'additions': 30, 'deletions': 4, 'changedFiles': 3,
+        'mergedAt': '2025-07-01T10:00:00Z', 'baseRefName': 'main', 'headRefName': 'feat',
+        'mergeable': 'MERGEABLE', 'mergeStateStatus': 'CLEAN',
+        'commits': {'totalCount': 2}, 'comments': {'totalCount': 5},
+        'reviews': {'nodes': [{'comments': {'totalCount': 1}}, {'comments': {'totalCount': 2}}]},
+        'mergedBy': {'login': 'octocat'}, 'mergeCommit': {'oid': 'abc123'}
+    }
+    assert _shape(node) == {
+        'number': 12, 'additions': 30, 'deletions': 4, 'changed_files': 3,
+        'commits': 2, 'comments': 5, 'review_comments': 3,
+        'mergeable': True, 'mergeable_state': 'clean',
+        'merged_by': {'login': 'octocat'}, 'merge_commit_sha': 'abc123',
+        'merged_at': '2025-07-01T10:00:00Z',
+        'base': {'ref': 'main'}, 'head': {'ref': 'feat'}
+    }
+
+def test_mergeable_enum_mapping():
+    assert _shape({'mergeable': 'MERGEABLE'})['mergeable'] is True
+    assert _shape({'mergeable': 'CONFLICTING'})['mergeable'] is False
+    # REST reports null while GitHub is still computing mergeability
+    assert _shape({'mergeable': 'UNKNOWN'})['mergeable'] is None
+    assert _shape({'mergeStateStatus': 'DIRTY'})['mergeable_state'] == 'dirty'
+    assert _shape({'mergeStateStatus': None})['mergeable_state'] == 'unknown'
+
+def test_open_pr_nulls():
+    shaped = _shape({'number': 3, 'mergedBy': None, 'mergeCommit': None, 'reviews': None})
+    assert shaped['merged_by'] is None
+    assert shaped['merge_commit_sha'] is None
+    assert shaped['review_comments'] == 0
+    assert shaped['commits'] == 0
+
+if __name__ == "__main__":
+    test_merged_pr_mapping()
+    test_mergeable_enum_mapping()
+    test_open_pr_nulls()
+    print("✅ PR details mapping tests passed")
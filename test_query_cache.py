@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test the milvus_client query cache (no Milvus connection needed)
+"""
+
+import threading
+import time
+
+import milvus_client
+from milvus_client import _cached_call
+
+def _reset():
+    milvus_client._query_cache.clear()
+
+def test_cached_call_reuses_result_within_ttl():
+    _reset()
+    calls = []
+    fn = lambda: calls.append(1) or len(calls)
+    assert _cached_call("q", 30, fn) == 1
+    assert _cached_call("q", 30, fn) == 1
+    assert len(calls) == 1
+    
+    # An expired entry is recomputed
+    assert _cached_call("expired", 0, fn) == 2
+    assert _cached_call("expired", 0, fn) == 3
+
+def test_cached_call_shares_in_flight_call():
+    _reset()
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+    
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "rows"
+    
+    results = []
+    owner = threading.Thread(target=lambda: results.append(_cached_call("same", 30, slow)))
+    owner.start()
+    started.wait(5)
+    waiter = threading.Thread(target=lambda: results.append(_cached_call("same", 30, slow)))
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    owner.join(5)
+    waiter.join(5)
+    
+    assert results == ["rows", "rows"]
+    assert len(calls) == 1
+
+def test_cached_call_does_not_cache_failures():
+    _reset()
+    attempts = []
+    
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("UNAVAILABLE")
+        return "ok"
+    
+    try:
+        _cached_call("flaky", 30, flaky)
+        assert False, "first call should raise"
+    except RuntimeError:
+        pass
+    assert "flaky" not in milvus_client._query_cache
+    assert _cached_call("flaky", 30, flaky) == "ok"
+    assert len(attempts) == 2
+
+def test_cached_call_evicts_least_recently_used():
+    _reset()
+    size = milvus_client.QUERY_CACHE_SIZE
+    for i in range(size):
+        _cached_call(i, 30, lambda i=i: i)
+    _cached_call(0, 30, lambda: "recomputed")  # Touch 0 so 1 is now the oldest
+    _cached_call(size, 30, lambda: size)
+    
+    assert len(milvus_client._query_cache) == size
+    assert 0 in milvus_client._query_cache
+    assert 1 not in milvus_client._query_cache
+    assert _cached_call(0, 30, lambda: "recomputed") == 0
+
+if __name__ == "__main__":
+    test_cached_call_reuses_result_within_ttl()
+    test_cached_call_shares_in_flight_call()
+    test_cached_call_does_not_cache_failures()
+    test_cached_call_evicts_least_recently_used()
+    print("✅ Query cache tests passed")
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Test that direct_handlers._top_rows ranks like heapq.nlargest (no Milvus connection needed)
+"""
+
+import heapq
+import random
+
+import numpy as np
+
+from direct_handlers import _top_rows
+
+def _expected(rows, values, limit):
+    # nlargest is stable: equal values keep their original order
+    return [rows[i] for i in heapq.nlargest(limit, range(len(rows)), key=lambda i: values[i])]
+
+def test_top_rows_matches_nlargest():
+    rng = random.Random(7)
+    for _ in range(500):
+        n = rng.randint(0, 40)
+        # A small value range forces plenty of ties around the cut-off
+        values = np.array([rng.randint(0, 5) for _ in range(n)], dtype=np.int64)
+        rows = [{"pr_id": i} for i in range(n)]
+        limit = rng.randint(0, n + 3)
+        assert _top_rows(rows, values, limit) == _expected(rows, values, limit), (values.tolist(), limit)
+
+def test_top_rows_edge_cases():
+    rows = [{"pr_id": i} for i in range(3)]
+    values = np.array([2, 9, 2], dtype=np.int64)
+    assert _top_rows(rows, values, 0) == []
+    assert _top_rows([], np.array([], dtype=np.int64), 5) == []
+    assert _top_rows(rows, values, 2) == [rows[1], rows[0]]
+    assert _top_rows(rows, values, 10) == [rows[1], rows[0], rows[2]]
+
+if __name__ == "__main__":
+    test_top_rows_matches_nlargest()
+    test_top_rows_edge_cases()
+    print("✅ _top_rows tests passed")
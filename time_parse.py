@@ -9,6 +9,59 @@ from datetime import datetime, timedelta, date
 from typing import Tuple, Optional
 import calendar
 
+# Patterns are compiled once at import; this module runs on every routed query.
+# Keywords that suggest a time window (word boundaries avoid false matches)
+_TIME_KEYWORD_RE = re.compile(
+    r'\b(?:last|yesterday|today|this week|this month|this year|in|during|since|from|to|between'
+    r'|january|february|march|april|may|june|july|august|september|october|november|december'
+    r'|jan|feb|mar|apr|jun|jul|aug|sep|oct|nov|dec)\b'
+)
+
+# Time expressions, in priority order: the first pattern that matches anywhere wins
+_TIME_EXPRESSION_PATTERNS = [re.compile(pattern) for pattern in (
+    r'last\s+(\d+)\s+(day|week|month|year)s?',
+    r'last\s+(one|two|three|four|five|six|seven|eight|nine|ten)\s+(day|week|month|year)s?',
+    r'last\s+(day|week|month|year)',
+    r'yesterday',
+    r'today',
+    r'this\s+(week|month|year)',
+    r'in\s+(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{4}',
+    r'in\s+(jan|feb|mar|apr|jun|jul|aug|sep|oct|nov|dec)\s+\d{4}',
+    r'(\d{1,2})/(\d{1,2})/(\d{4})',
+    r'(\d{4})-(\d{1,2})-(\d{1,2})',
+)]
+
+# "last N units", "last <word> units" and "last unit" in a single pattern
+_LAST_RE = re.compile(
+    r'last\s+(?:(?:(?P<num>\d+)|(?P<word>one|two|three|four|five|six|seven|eight|nine|ten))\s+)?'
+    r'(?P<unit>day|week|month|year)s?'
+)
+_WORD_TO_NUMBER = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10
+}
+
+_MONTH_YEAR_RE = re.compile(r'in\s+(\w+)\s+(\d{4})')
+_US_DATE_RE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+_ISO_DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+
+_FILE_QUERY_RE = re.compile(
+    r'show\s+changes?\s+in\s+[a-zA-Z0-9_.-]+'
+    r'|changes?\s+to\s+[a-zA-Z0-9_.-]+'
+    r'|[a-zA-Z0-9_.-]+\.(?:py|js|java|cpp|c|h|ts|jsx|tsx|md|txt|json|yaml|yml)$'
+)
+_AUTHOR_QUERY_RE = re.compile(
+    r'changes?\s+(?:made|done)\s+by\s+[a-zA-Z0-9_-]+'
+    r'|prs?\s+(?:by|from)\s+[a-zA-Z0-9_-]+'
+    r'|[a-zA-Z0-9_-]+\s+(?:prs?|changes?|commits?)'
+    r'|what\s+did\s+[a-zA-Z0-9_-]+\s+do'
+)
+_RISK_QUERY_RE = re.compile(
+    r'\b(?:riskiest|most\s+risky|high\s+risk)\b'
+    r'|\b(?:risk|vulnerability|security)\b'
+    r'|\b(?:dangerous|critical|sensitive)\b'
+)
+
 def parse_time(query: str) -> Tuple[int, int]:
     """
     Parse time expressions from natural language queries.
@@ -46,47 +99,12 @@ def parse_time(query: str) -> Tuple[int, int]:
 
 def has_time_expression(query: str) -> bool:
     """Check if query contains time-related keywords"""
-    # Use word boundaries to avoid false matches
-    import re
-    
-    time_patterns = [
-        r'\blast\b',  # last week, last month, etc.
-        r'\byesterday\b',
-        r'\btoday\b',
-        r'\bthis week\b',
-        r'\bthis month\b',
-        r'\bthis year\b',
-        r'\bin\b',  # in July 2025
-        r'\bduring\b',
-        r'\bsince\b',
-        r'\bfrom\b',
-        r'\bto\b',
-        r'\bbetween\b',
-        r'\bjanuary\b', r'\bfebruary\b', r'\bmarch\b', r'\bapril\b', r'\bmay\b', r'\bjune\b',
-        r'\bjuly\b', r'\baugust\b', r'\bseptember\b', r'\boctober\b', r'\bnovember\b', r'\bdecember\b',
-        r'\bjan\b', r'\bfeb\b', r'\bmar\b', r'\bapr\b', r'\bjun\b', r'\bjul\b', r'\baug\b', r'\bsep\b', r'\boct\b', r'\bnov\b', r'\bdec\b'
-    ]
-    
-    return any(re.search(pattern, query.lower()) for pattern in time_patterns)
+    return _TIME_KEYWORD_RE.search(query.lower()) is not None
 
 def extract_time_expression(query: str) -> Optional[str]:
     """Extract time expression from query"""
-    # Patterns for time expressions
-    patterns = [
-        r'last\s+(\d+)\s+(day|week|month|year)s?',
-        r'last\s+(one|two|three|four|five|six|seven|eight|nine|ten)\s+(day|week|month|year)s?',
-        r'last\s+(day|week|month|year)',
-        r'yesterday',
-        r'today',
-        r'this\s+(week|month|year)',
-        r'in\s+(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{4}',
-        r'in\s+(jan|feb|mar|apr|jun|jul|aug|sep|oct|nov|dec)\s+\d{4}',
-        r'(\d{1,2})/(\d{1,2})/(\d{4})',
-        r'(\d{4})-(\d{1,2})-(\d{1,2})',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, query)
+    for pattern in _TIME_EXPRESSION_PATTERNS:
+        match = pattern.search(query)
         if match:
             return match.group(0)
     
@@ -131,32 +149,16 @@ def parse_time_expression(time_expr: str) -> Tuple[datetime, datetime]:
 
 def parse_last_expression(time_expr: str, now: datetime) -> Tuple[datetime, datetime]:
     """Parse 'last N days/weeks/months/years' expressions"""
-    # Extract number and unit - handle both digits and written numbers
-    match = re.search(r'last\s+(\d+)\s+(day|week|month|year)s?', time_expr)
+    # Extract number and unit - handle digits, written numbers and no number at all
+    match = _LAST_RE.search(time_expr)
     if not match:
-        # Try written numbers
-        match = re.search(r'last\s+(one|two|three|four|five|six|seven|eight|nine|ten)\s+(day|week|month|year)s?', time_expr)
-        if not match:
-            # Try "last week", "last month", etc. (no number)
-            match = re.search(r'last\s+(day|week|month|year)s?', time_expr)
-            if not match:
-                return get_default_time_window_datetime()
-            number = 1
-            unit = match.group(1)
-        else:
-            number_str = match.group(1)
-            unit = match.group(2)
-            
-            # Convert written numbers to digits
-            word_to_number = {
-                'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
-                'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10
-            }
-            number = word_to_number.get(number_str.lower(), 1)
+        return get_default_time_window_datetime()
+    
+    unit = match.group('unit')
+    if match.group('num'):
+        number = int(match.group('num'))
     else:
-        number_str = match.group(1)
-        unit = match.group(2)
-        number = int(number_str)
+        number = _WORD_TO_NUMBER.get(match.group('word'), 1)
     
     # Calculate start time based on unit
     if unit == 'day':
@@ -206,7 +208,7 @@ def parse_month_year_expression(time_expr: str) -> Tuple[datetime, datetime]:
     }
     
     # Extract month and year
-    match = re.search(r'in\s+(\w+)\s+(\d{4})', time_expr)
+    match = _MONTH_YEAR_RE.search(time_expr)
     if not match:
         return get_default_time_window_datetime()
     
@@ -230,7 +232,7 @@ def parse_month_year_expression(time_expr: str) -> Tuple[datetime, datetime]:
 def parse_date_expression(date_expr: str) -> Tuple[datetime, datetime]:
     """Parse date expressions like MM/DD/YYYY or YYYY-MM-DD"""
     # Try MM/DD/YYYY format
-    match = re.search(r'(\d{1,2})/(\d{1,2})/(\d{4})', date_expr)
+    match = _US_DATE_RE.search(date_expr)
     if match:
         month, day, year = int(match.group(1)), int(match.group(2)), int(match.group(3))
         start_time = datetime(year, month, day, 0, 0, 0)
@@ -238,7 +240,7 @@ def parse_date_expression(date_expr: str) -> Tuple[datetime, datetime]:
         return start_time, end_time
     
     # Try YYYY-MM-DD format
-    match = re.search(r'(\d{4})-(\d{1,2})-(\d{1,2})', date_expr)
+    match = _ISO_DATE_RE.search(date_expr)
     if match:
         year, month, day = int(match.group(1)), int(match.group(2)), int(match.group(3))
         start_time = datetime(year, month, day, 0, 0, 0)
@@ -260,13 +262,7 @@ def get_default_time_window_datetime() -> Tuple[datetime, datetime]:
 
 def is_file_specific_query(query: str) -> bool:
     """Check if query is asking for a specific file (no time constraint needed)"""
-    file_patterns = [
-        r'show\s+changes?\s+in\s+[a-zA-Z0-9_.-]+',
-        r'changes?\s+to\s+[a-zA-Z0-9_.-]+',
-        r'[a-zA-Z0-9_.-]+\.(py|js|java|cpp|c|h|ts|jsx|tsx|md|txt|json|yaml|yml)$'
-    ]
-    
-    return any(re.search(pattern, query) for pattern in file_patterns)
+    return _FILE_QUERY_RE.search(query) is not None
 
 def get_all_time_window() -> Tuple[int, int]:
     """Get a very wide time window (last 5 years) for comprehensive searches"""
@@ -281,14 +277,7 @@ def get_all_time_window_datetime() -> Tuple[datetime, datetime]:
 
 def is_author_specific_query(query: str) -> bool:
     """Check if query is asking about a specific author"""
-    author_patterns = [
-        r'changes?\s+(made|done)\s+by\s+[a-zA-Z0-9_-]+',
-        r'prs?\s+(by|from)\s+[a-zA-Z0-9_-]+',
-        r'[a-zA-Z0-9_-]+\s+(prs?|changes?|commits?)',
-        r'what\s+did\s+[a-zA-Z0-9_-]+\s+do'
-    ]
-    
-    return any(re.search(pattern, query) for pattern in author_patterns)
+    return _AUTHOR_QUERY_RE.search(query) is not None
 
 def get_author_default_time_window() -> Tuple[int, int]:
     """Get default time window for author queries (last 3 months) as epoch timestamps"""
@@ -303,13 +292,7 @@ def get_author_default_time_window_datetime() -> Tuple[datetime, datetime]:
 
 def is_risk_related_query(query: str) -> bool:
     """Check if query is asking about risk-related information"""
-    risk_patterns = [
-        r'\b(riskiest|most\s+risky|high\s+risk)\b',
-        r'\b(risk|vulnerability|security)\b',
-        r'\b(dangerous|critical|sensitive)\b'
-    ]
-    
-    return any(re.search(pattern, query.lower()) for pattern in risk_patterns)
+    return _RISK_QUERY_RE.search(query.lower()) is not None
 
 def get_risk_default_time_window() -> Tuple[int, int]:
     """Get default time window for risk queries (last 2 years) as epoch timestamps"""